@@ -5,7 +5,7 @@ import tempfile
 import os
 from src.speech_to_text import SpeechToText
 from src.text_to_speech import TextToSpeech
-from src.llm_handler_groq import LLMHandler
+from src.llm_handler import LLMHandler
 from src.rag_engine import RAGEngine
 from src.memory_manager import MemoryManager
 from src.intent_recognizer import IntentRecognizer
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Assistant Load Test
+Runs concurrent conversations through the full text pipeline (intent, retrieval,
+memory, LLM, TTS) and reports per-stage and end-to-end latency percentiles
+"""
+
+import argparse
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from config import Config
+
+SAMPLE_QUESTIONS = [
+    "What are your business hours on weekdays?",
+    "Can you explain how the pricing works for the premium plan?",
+    "How do I reset my password?",
+    "Do you offer discounts for non-profit organizations?",
+    "What integrations does your product support?",
+    "How long does onboarding usually take?"
+]
+
+STAGES = ('intent', 'retrieval', 'memory', 'llm', 'tts')
+
+def run_session(assistant, turns, offset):
+    """Run one conversation and return the timing report of each turn"""
+    session_id = assistant.start_new_session()
+    reports = []
+
+    for turn in range(turns):
+        question = SAMPLE_QUESTIONS[(offset + turn) % len(SAMPLE_QUESTIONS)]
+        result = assistant.process_text_input(session_id, question)
+        if result['success']:
+            reports.append(result['timings'])
+        else:
+            print(f"⚠️ Turn failed: {result.get('error')}")
+
+    assistant.end_session(session_id)
+    return reports
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the voice assistant's text pipeline")
+    parser.add_argument('--provider', default='local', help="LLM provider (default: the offline local backend)")
+    parser.add_argument('--sessions', type=int, default=20, help="Concurrent conversations")
+    parser.add_argument('--turns', type=int, default=5, help="Turns per conversation")
+    parser.add_argument('--kb', default=f"{Config.EMBEDDINGS_DIR}/knowledge_base",
+                        help="Saved knowledge base to retrieve from (skipped if missing)")
+    parser.add_argument('--skip-tts', action='store_true', help="Leave speech synthesis out of the turn")
+    args = parser.parse_args()
+
+    # Chosen before the assistant builds its LLM handler
+    Config.LLM_PROVIDER = args.provider
+    if args.provider == 'local':
+        print(f"🧪 Local backend: {Config.LOCAL_LLM_TIME_TO_FIRST_TOKEN:.2f}s TTFT, "
+              f"{Config.LOCAL_LLM_TOKENS_PER_SECOND:.0f} tokens/s")
+
+    from main_voice_assistant import VoiceAssistant
+    assistant = VoiceAssistant()
+    assistant.load_knowledge_base(args.kb)
+    if args.skip_tts:
+        assistant.tts.text_to_speech = lambda text: None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as executor:
+        futures = [executor.submit(run_session, assistant, args.turns, i) for i in range(args.sessions)]
+        reports = [report for future in futures for report in future.result()]
+    elapsed = time.perf_counter() - start
+
+    if not reports:
+        print("❌ No turns completed")
+        return
+
+    durations = defaultdict(list)
+    for report in reports:
+        durations['total'].append(report['total'])
+        for name in STAGES:
+            stage = report['stages'].get(name)
+            if stage and 'duration' in stage:
+                durations[name].append(stage['duration'])
+
+    print(f"📊 {len(reports)} turns over {args.sessions} sessions in {elapsed:.1f}s "
+          f"({len(reports) / elapsed:.1f} turns/s)")
+    print(f"{'stage':<10} {'p50 (s)':>8} {'p95 (s)':>8} {'p99 (s)':>8}")
+    for name in STAGES + ('total',):
+        if durations[name]:
+            p50, p95, p99 = np.percentile(durations[name], [50, 95, 99])
+            print(f"{name:<10} {p50:>8.3f} {p95:>8.3f} {p99:>8.3f}")
+
+if __name__ == "__main__":
+    main()
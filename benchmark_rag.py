@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Vector Index Benchmark
+Reports recall and query latency of each index type against the exact flat index
+"""
+
+import argparse
+from config import Config
+from src.rag_engine import RAGEngine
+from src.vector_index import INDEX_TYPES
+
+DEFAULT_KB_PATH = f"{Config.EMBEDDINGS_DIR}/knowledge_base"
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare vector index types on a saved knowledge base")
+    parser.add_argument('--kb', default=DEFAULT_KB_PATH, help="Saved knowledge base path (without extension)")
+    parser.add_argument('--index-types', nargs='+', default=list(INDEX_TYPES), help="Index types to compare")
+    parser.add_argument('--top-k', type=int, default=Config.TOP_K_RESULTS, help="Neighbours per query")
+    parser.add_argument('--nprobe', type=int, default=Config.INDEX_NPROBE, help="IVF lists scanned per query")
+    parser.add_argument('--ef-search', type=int, default=Config.INDEX_EF_SEARCH, help="HNSW search list size")
+    parser.add_argument('--queries', nargs='+', help="Query texts (default: a sample of the chunks themselves)")
+    args = parser.parse_args()
+
+    rag = RAGEngine()
+    if not rag.load_index(args.kb):
+        print(f"❌ Could not load knowledge base from {args.kb}")
+        return
+
+    rag.set_search_params(args.nprobe, args.ef_search)
+    print(f"📚 {len(rag.documents)} chunks, nprobe={rag.nprobe}, efSearch={rag.ef_search}, top_k={args.top_k}")
+    print(f"{'index':<10} {'build (s)':>10} {'recall':>8} {'mean (ms)':>10} {'p95 (ms)':>9}")
+
+    for result in rag.index_report(args.queries, args.index_types, args.top_k):
+        print(f"{result['index_type']:<10} {result['build_seconds']:>10.2f} {result['recall']:>8.1%} "
+              f"{result['mean_ms']:>10.3f} {result['p95_ms']:>9.3f}")
+
+if __name__ == "__main__":
+    main()
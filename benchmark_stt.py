@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Speech-to-Text Benchmark
+Reports real-time factor and word error rate for each STT profile
+"""
+
+import argparse
+import os
+import re
+import time
+from config import Config
+from src.audio_decoder import AudioDecoder, WHISPER_SAMPLE_RATE
+from src.whisper_profiles import STT_PROFILES, load_whisper_model, get_transcribe_options
+
+DEFAULT_CLIPS_DIR = os.path.join(Config.DATA_DIR, 'benchmarks', 'stt')
+
+# Reference sentences used by --synthesize to create sample clips
+SAMPLE_SENTENCES = [
+    "What are your business hours on weekdays?",
+    "I would like to schedule a demo with your sales team next Tuesday.",
+    "My order arrived damaged and I want a refund.",
+    "Can you explain how the pricing works for the premium plan?",
+    "Please send the invoice to my email address.",
+    "The application keeps crashing when I try to upload a file."
+]
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.webm', '.ogg', '.flac')
+
+def normalize_words(text):
+    """Lowercase, strip punctuation and split into words"""
+    return re.sub(r"[^\w\s']", " ", text.lower()).split()
+
+def word_error_rate(reference, hypothesis):
+    """Word-level Levenshtein distance divided by reference length"""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+
+    return previous[-1] / len(ref)
+
+def load_clips(clips_dir):
+    """Load (name, audio, reference) for every clip with a matching .txt transcript"""
+    decoder = AudioDecoder()
+    clips = []
+
+    for filename in sorted(os.listdir(clips_dir)):
+        name, extension = os.path.splitext(filename)
+        reference_path = os.path.join(clips_dir, f"{name}.txt")
+        if extension not in AUDIO_EXTENSIONS or not os.path.exists(reference_path):
+            continue
+
+        with open(os.path.join(clips_dir, filename), 'rb') as f:
+            audio = decoder.decode(f.read(), copy=True)
+        with open(reference_path, 'r', encoding='utf-8') as f:
+            reference = f.read().strip()
+
+        clips.append((name, audio, reference))
+
+    return clips
+
+def synthesize_clips(clips_dir):
+    """Create sample clips and reference transcripts with gTTS"""
+    from gtts import gTTS
+
+    os.makedirs(clips_dir, exist_ok=True)
+    for i, sentence in enumerate(SAMPLE_SENTENCES):
+        name = f"sample_{i:02d}"
+        gTTS(text=sentence, lang='en', slow=False).save(os.path.join(clips_dir, f"{name}.mp3"))
+        with open(os.path.join(clips_dir, f"{name}.txt"), 'w', encoding='utf-8') as f:
+            f.write(sentence)
+    print(f"Wrote {len(SAMPLE_SENTENCES)} sample clips to {clips_dir}")
+
+def benchmark_profile(profile_name, model_name, clips):
+    """Transcribe every clip under a profile and return aggregate metrics"""
+    load_start = time.perf_counter()
+    model = load_whisper_model(model_name, profile_name)
+    load_time = time.perf_counter() - load_start
+    options = get_transcribe_options(model, profile_name)
+
+    # Warm-up pass so lazy initialization is not charged to the first clip
+    model.transcribe(clips[0][1], **options)
+
+    audio_seconds = 0.0
+    processing_seconds = 0.0
+    error_rates = []
+
+    for name, audio, reference in clips:
+        start = time.perf_counter()
+        hypothesis = model.transcribe(audio, **options)["text"].strip()
+        processing_seconds += time.perf_counter() - start
+        audio_seconds += len(audio) / WHISPER_SAMPLE_RATE
+        error_rates.append(word_error_rate(reference, hypothesis))
+
+    return {
+        'profile': profile_name,
+        'load_time': load_time,
+        'rtf': processing_seconds / audio_seconds if audio_seconds else 0.0,
+        'wer': sum(error_rates) / len(error_rates)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark STT profiles")
+    parser.add_argument('--clips', default=DEFAULT_CLIPS_DIR, help="Directory of audio clips with .txt references")
+    parser.add_argument('--model', default=Config.WHISPER_MODEL, help="Whisper model size")
+    parser.add_argument('--profiles', nargs='+', default=list(STT_PROFILES), help="Profiles to compare")
+    parser.add_argument('--synthesize', action='store_true', help="Generate sample clips with gTTS first")
+    args = parser.parse_args()
+
+    if args.synthesize:
+        synthesize_clips(args.clips)
+
+    if not os.path.isdir(args.clips):
+        print(f"❌ Clips directory not found: {args.clips} (run with --synthesize to create samples)")
+        return
+
+    clips = load_clips(args.clips)
+    if not clips:
+        print(f"❌ No clips with reference transcripts in {args.clips}")
+        return
+
+    total_audio = sum(len(audio) for _, audio, _ in clips) / WHISPER_SAMPLE_RATE
+    print(f"🎧 {len(clips)} clips, {total_audio:.1f}s of audio, model '{args.model}'")
+    print(f"{'profile':<10} {'load (s)':>9} {'RTF':>7} {'WER':>7}")
+
+    for profile_name in args.profiles:
+        result = benchmark_profile(profile_name, args.model, clips)
+        print(f"{result['profile']:<10} {result['load_time']:>9.2f} {result['rtf']:>7.3f} {result['wer']:>7.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ load_dotenv()
 
 class Config:
     # API Keys
-    #OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+    OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     GROQ_API_KEY = os.getenv('GROQ_API_KEY')
     ELEVENLABS_API_KEY = os.getenv('ELEVENLABS_API_KEY')
     
@@ -15,22 +15,113 @@ class Config:
     # Model Settings
     #LLM_MODEL = 'gpt-4'
     LLM_MODEL = 'mixtral-8x7b' 
+    LLM_PROVIDER = os.getenv('LLM_PROVIDER', 'groq')  # 'groq', 'openai' or 'local'
+    LLM_API_BASE_URL = os.getenv('LLM_API_BASE_URL')  # override, e.g. the local fake server
     EMBEDDING_MODEL = 'sentence-transformers/all-MiniLM-L6-v2'
     
+    # Offline LLM backend (LLM_PROVIDER=local) for load tests without network
+    LOCAL_LLM_TIME_TO_FIRST_TOKEN = float(os.getenv('LOCAL_LLM_TIME_TO_FIRST_TOKEN', '0.3'))  # seconds
+    LOCAL_LLM_TOKENS_PER_SECOND = float(os.getenv('LOCAL_LLM_TOKENS_PER_SECOND', '50'))
+    
     # Audio Settings
     AUDIO_FORMAT = 'mp3'
     SAMPLE_RATE = 44100
     CHUNK_SIZE = 1024
     
+    # Speech-to-Text Settings
+    WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'base')  # tiny, base, small, medium, ...
+    STT_PROFILE = os.getenv('STT_PROFILE', 'accurate')  # 'accurate' or 'fast'
+    STT_LANGUAGE = 'en'  # fixed language used by the fast profile
+    STT_STREAMING = False
+    STT_STREAM_WINDOW = 8.0  # seconds of audio decoded per sliding window
+    STT_PARTIAL_INTERVAL = 0.6  # seconds of new audio between partial transcripts
+    STT_END_SILENCE = 0.5  # seconds of silence that ends an utterance
+    STT_PRE_ROLL = 0.3  # seconds kept from before speech onset
+    STT_BATCHING = False  # share one batched Whisper decoder across sessions
+    STT_BATCH_MAX_SIZE = 8
+    STT_BATCH_MAX_WAIT = 0.05  # seconds to wait for a batch to fill
+    STT_WORKERS = int(os.getenv('STT_WORKERS', 0))  # >0 runs Whisper in worker processes
+    STT_TORCH_THREADS = 1  # torch intra-op threads per worker
+    STT_MAX_PENDING = 16  # in-flight utterances before callers block
+    STT_QUEUE_TIMEOUT = 5.0  # seconds a caller waits for a free slot
+    
+    # Text-to-Speech Settings
+    TTS_STREAM_WORKERS = 3  # sentences synthesized ahead of playback
+    TTS_MIN_SEGMENT_LENGTH = 20  # shorter sentences are merged with the next one
+    TTS_MAX_SEGMENT_LENGTH = 250  # longer sentences are split at clause boundaries
+    TTS_CACHE_ENABLED = True
+    TTS_CACHE_MEMORY_BYTES = 32 * 1024 * 1024
+    TTS_CACHE_DISK_BYTES = 256 * 1024 * 1024
+    TTS_PRECOMPUTE_PHRASES = True  # synthesize static phrases into the cache at startup
+    
+    # Voice Activity Detection
+    VAD_FRAME_DURATION = 0.02  # seconds per analysis frame
+    VAD_THRESHOLD_RATIO = 3.0  # speech must be this many times above the noise floor
+    VAD_MIN_THRESHOLD = 0.005  # absolute RMS floor for speech (float scale)
+    VAD_HANGOVER = 0.2  # seconds a speech decision is held after energy drops
+    VAD_PADDING = 0.1  # seconds of context kept around trimmed speech
+    VAD_NOISE_ADAPT_RATE = 0.05
+    
     # RAG Settings
-    CHUNK_SIZE_RAG = 1000
-    CHUNK_OVERLAP = 200
+    CHUNK_MAX_TOKENS = 256  # embedding-model tokens per chunk, capped at the model's limit
+    CHUNK_OVERLAP_TOKENS = 48  # tokens of trailing sentences repeated at the start of the next chunk
     MAX_CONTEXT_LENGTH = 4000
     TOP_K_RESULTS = 5
+    QUERY_EMBEDDING_CACHE_SIZE = 2048  # recently embedded queries kept in memory
+    KB_COMPACTION_RATIO = 0.2  # compact once this fraction of chunks is tombstoned
+    KB_EMBEDDING_DTYPE = 'float32'  # on-disk embedding matrix: 'float32' or 'float16'
+    KB_VERIFY_CHECKSUMS = False  # hash every file on load (slower startup)
+    
+    # Vector Index
+    INDEX_TYPE = os.getenv('INDEX_TYPE', 'auto')  # 'auto', 'flat', 'hnsw', 'ivf_flat' or 'ivf_pq'
+    INDEX_TRAIN_SAMPLE_SIZE = 50000  # vectors sampled to train IVF/PQ indexes
+    INDEX_NPROBE = 16  # IVF lists scanned per query
+    INDEX_EF_SEARCH = 64  # HNSW candidate list size per query
+    INDEX_HNSW_M = 32
+    INDEX_HNSW_EF_CONSTRUCTION = 80
+    INDEX_PQ_M = 48  # PQ sub-quantizers (8 dims each for 384-dim MiniLM)
+    INDEX_VECTOR_STORAGE = os.getenv('INDEX_VECTOR_STORAGE', 'float32')  # 'float32', 'float16' or 'pq'
+    KB_LEAN_MODE = os.getenv('KB_LEAN_MODE', 'false').lower() == 'true'  # no embeddings copy outside the index
+    
+    # Ingestion
+    SCRAPE_CONNECT_TIMEOUT = 5.0  # seconds
+    SCRAPE_READ_TIMEOUT = 20.0
+    INGEST_FETCH_WORKERS = 8  # URLs fetched concurrently (also the HTTP pool size)
+    INGEST_PER_HOST_LIMIT = 2  # concurrent requests to any one host
+    INGEST_PDF_WORKERS = int(os.getenv('INGEST_PDF_WORKERS', 0))  # processes extracting PDF pages; 0 = one per CPU
+    INGEST_PDF_PAGES_PER_TASK = 16  # pages extracted per worker task
+    INGEST_EMBED_BATCH_SIZE = 256  # chunks embedded and indexed together
+    
+    # Async LLM Client
+    LLM_REQUEST_TIMEOUT = 30.0
+    LLM_POOL_CONNECTIONS = 100  # pooled HTTP connections per process
+    LLM_MAX_CONCURRENCY = 16  # in-flight requests per provider
+    LLM_MAX_RETRIES = 3
+    LLM_RETRY_BASE_DELAY = 0.25  # seconds, doubled per attempt with full jitter
+    LLM_RETRY_MAX_DELAY = 4.0
+    LLM_HEDGE_DELAY = 2.0  # seconds before racing a duplicate request; 0 disables
+    
+    # Prompt Settings
+    PROMPT_CHECK_INTERVAL = 2.0  # seconds between mtime checks of prompt files
+    TOKENIZER_ENCODING = 'cl100k_base'  # tiktoken encoding used for token counts
+    PROMPT_TOKEN_BUDGET = 3000  # prompt tokens per request, excluding the completion
+    PROMPT_MIN_HISTORY_MESSAGES = 2  # recent messages kept ahead of summary and lower-ranked chunks
+    PROMPT_MIN_PARTIAL_TOKENS = 50  # smallest truncated context chunk worth including
+    PROMPT_TOKEN_CACHE_SIZE = 4096  # cached token counts for chunks and messages
+    
+    # Semantic Response Cache
+    SEMANTIC_CACHE_ENABLED = True
+    SEMANTIC_CACHE_THRESHOLD = 0.92  # cosine similarity needed to reuse an answer
+    SEMANTIC_CACHE_TTL = 3600  # seconds
+    SEMANTIC_CACHE_MAX_ENTRIES = 1000
+    
+    # Turn Execution
+    TURN_EXECUTOR_WORKERS = 8  # threads shared by all sessions for retrieval and memory stages
     
     # Memory Settings
     MAX_CONVERSATION_HISTORY = 10
     SESSION_TIMEOUT = 1800  # 30 minutes
+    SUMMARY_WORKERS = 2  # background threads folding evicted turns into session summaries
     
     # Intent Recognition
     INTENT_CONFIDENCE_THRESHOLD = 0.7
@@ -40,6 +131,7 @@ class Config:
     EMBEDDINGS_DIR = 'data/embeddings'
     DOCUMENTS_DIR = 'data/documents'
     PROMPTS_DIR = 'prompts'
+    TTS_CACHE_DIR = 'data/tts_cache'
     
     # Flask Settings
     FLASK_HOST = '0.0.0.0'
@@ -51,8 +143,10 @@ class Config:
         """Validate that required API keys are present"""
         missing_keys = []
         
-        if not cls.GROQ_API_KEY_API_KEY:
+        if cls.LLM_PROVIDER == 'groq' and not cls.GROQ_API_KEY:
             missing_keys.append('GROQ_API_KEY')
+        if cls.LLM_PROVIDER == 'openai' and not cls.OPENAI_API_KEY:
+            missing_keys.append('OPENAI_API_KEY')
         if not cls.ELEVENLABS_API_KEY:
             missing_keys.append('ELEVENLABS_API_KEY')
             
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Fake LLM Server
+Local OpenAI-compatible chat completion endpoint for exercising the LLM
+handlers offline, with configurable latency, slow tails and errors
+"""
+
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeLLMRequestHandler(BaseHTTPRequestHandler):
+    # Set from the command line in main()
+    options = None
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self.send_error(404)
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            self.send_error(400, "Invalid JSON")
+            return
+
+        options = self.options
+        if random.random() < options.error_rate:
+            self._send_json(random.choice([429, 500, 503]), {"error": {"message": "Injected failure"}},
+                            {"Retry-After": "0.1"})
+            return
+
+        latency = options.latency + random.uniform(0, options.jitter)
+        if random.random() < options.slow_rate:
+            latency += options.slow_latency
+        time.sleep(latency)
+
+        content = self._make_reply(payload)
+        if payload.get('stream'):
+            self._stream(payload, content)
+        else:
+            self._send_json(200, {
+                "id": "fake-completion",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": payload.get('model', 'fake'),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop"
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(content.split()), "total_tokens": 0}
+            })
+
+    def _make_reply(self, payload):
+        """Deterministic reply derived from the last user message"""
+        messages = payload.get('messages', [])
+        last_user = next((m['content'] for m in reversed(messages) if m.get('role') == 'user'), "")
+        words = f"This is a fake response to: {last_user}".split()
+        return " ".join(words[:payload.get('max_tokens') or len(words)])
+
+    def _stream(self, payload, content):
+        """Send the reply as server-sent events, one word per chunk"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        for i, word in enumerate(content.split()):
+            chunk = {
+                "id": "fake-completion",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": payload.get('model', 'fake'),
+                "choices": [{"index": 0, "delta": {"content": word if i == 0 else f" {word}"}, "finish_reason": None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(self.options.token_interval)
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.options.verbose:
+            super().log_message(format, *args)
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible LLM server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency', type=float, default=0.2, help="Base seconds before replying")
+    parser.add_argument('--jitter', type=float, default=0.1, help="Extra random seconds per request")
+    parser.add_argument('--slow-rate', type=float, default=0.05, help="Fraction of requests in the slow tail")
+    parser.add_argument('--slow-latency', type=float, default=3.0, help="Extra seconds for slow-tail requests")
+    parser.add_argument('--error-rate', type=float, default=0.05, help="Fraction of requests failing with 429/5xx")
+    parser.add_argument('--token-interval', type=float, default=0.02, help="Seconds between streamed tokens")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    FakeLLMRequestHandler.options = args
+    server = ThreadingHTTPServer((args.host, args.port), FakeLLMRequestHandler)
+    print(f"🤖 Fake LLM server on http://{args.host}:{args.port}/v1 (set LLM_API_BASE_URL to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopping fake LLM server")
+
+if __name__ == "__main__":
+    main()
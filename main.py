@@ -36,13 +36,18 @@ def main():
         print("=" * 40)
         
         # Main conversation loop
+        playback = None
         while True:
             try:
                 print("\n🎤 Listening... (or type your message)")
                 
-                # Get user input (voice or text)
+                # Get user input (voice or text) while the previous response keeps playing
                 user_input = input("You (or press Enter to use microphone): ").strip()
                 
+                # The user has moved on, so stop the previous response
+                if playback and not playback.done:
+                    playback.cancel()
+                
                 if user_input.lower() in ['quit', 'exit', 'bye']:
                     print("👋 Goodbye!")
                     break
@@ -68,7 +73,7 @@ def main():
                     # Play audio response
                     if result['response_audio']:
                         print("🔊 Playing audio response...")
-                        assistant.tts.play_audio(result['response_audio'])
+                        playback = assistant.tts.play_audio(result['response_audio'])
                 else:
                     print(f"❌ Error: {result.get('error', 'Unknown error')}")
                     print(f"🤖 Assistant: {result['response_text']}")
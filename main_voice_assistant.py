@@ -1,15 +1,20 @@
 import uuid
-from typing import Dict, Optional
+from typing import Dict
 from src.speech_to_text import SpeechToText
 from src.text_to_speech import TextToSpeech
-#from src.llm_handler_openAI import LLMHandler
-from src.llm_handler_groq import LLMHandler
+from src.llm_handler import LLMHandler
 from src.rag_engine import RAGEngine
 from src.memory_manager import MemoryManager
 from src.intent_recognizer import IntentRecognizer
+from src.semantic_cache import SemanticResponseCache
+from src.turn_executor import TurnExecutor
 from config import Config
 
 class VoiceAssistant:
+    NO_SPEECH_MESSAGE = "I didn't hear anything. Could you please try again?"
+    AUDIO_ERROR_MESSAGE = "I'm sorry, I'm having trouble with the audio. Could you try again?"
+    TECHNICAL_ERROR_MESSAGE = "I apologize, but I'm experiencing some technical difficulties. Please try again."
+    
     def __init__(self):
         print("Initializing Voice Assistant...")
         
@@ -18,26 +23,37 @@ class VoiceAssistant:
         self.tts = TextToSpeech()
         self.llm = LLMHandler()
         self.rag = RAGEngine()
-        self.memory = MemoryManager()
+        self.memory = MemoryManager(summarize=self.llm.update_summary)
         self.intent_recognizer = IntentRecognizer()
+        self.turn_executor = TurnExecutor()
+        
+        # Reuse answers to reworded repeats of earlier questions
+        self.response_cache = (
+            SemanticResponseCache(self.rag.encode_queries) if Config.SEMANTIC_CACHE_ENABLED else None
+        )
+        
+        # Warm the TTS cache with responses that never change
+        if Config.TTS_PRECOMPUTE_PHRASES:
+            self.tts.precompute_phrases(self.get_static_phrases())
         
         print("Voice Assistant initialized successfully!")
     
+    def get_static_phrases(self) -> list:
+        """Get all fixed responses the assistant can speak"""
+        phrases = [self.NO_SPEECH_MESSAGE, self.AUDIO_ERROR_MESSAGE, self.TECHNICAL_ERROR_MESSAGE]
+        phrases.extend(self.intent_recognizer.get_static_escalation_messages())
+        return phrases
+    
     def setup_knowledge_base(self, urls: list = None, pdf_paths: list = None):
         """Set up the knowledge base with URLs and PDFs"""
         print("Setting up knowledge base...")
         
-        if urls:
-            for url in urls:
-                self.rag.add_url(url)
-        
-        if pdf_paths:
-            for pdf_path in pdf_paths:
-                self.rag.add_pdf(pdf_path)
+        stats = self.rag.ingest(urls, pdf_paths)
+        print(f"Ingested {stats['pages']} pages into {stats['chunks']} chunks in {stats['seconds']:.1f}s "
+              f"({stats['pages_per_second']:.1f} pages/s, {stats['chunks_per_second']:.1f} chunks/s)")
         
         if self.rag.documents:
-            self.rag.build_index()
-            print(f"Knowledge base ready with {len(self.rag.documents)} documents")
+            print(f"Knowledge base ready with {self.rag.document_count} documents")
         else:
             print("Warning: No documents added to knowledge base")
     
@@ -54,7 +70,7 @@ class VoiceAssistant:
                 return {
                     'success': False,
                     'error': 'No speech detected',
-                    'response_text': "I didn't hear anything. Could you please try again?",
+                    'response_text': self.NO_SPEECH_MESSAGE,
                     'audio_response': None
                 }
             
@@ -64,7 +80,7 @@ class VoiceAssistant:
             return self.process_text_input(session_id, user_text)
             
         except Exception as e:
-            error_message = "I'm sorry, I'm having trouble with the audio. Could you try again?"
+            error_message = self.AUDIO_ERROR_MESSAGE
             return {
                 'success': False,
                 'error': str(e),
@@ -75,47 +91,68 @@ class VoiceAssistant:
     def process_text_input(self, session_id: str, user_text: str) -> Dict:
         """Process text input and return response"""
         try:
+            turn = self.turn_executor.new_turn()
+            
+            # Cached answers are shared by all sessions, so only turns that depend on the question
+            # alone may use them: no history, summary, profile or personal details in the text.
+            # They are also only reusable for the same knowledge base and prompt.
+            cache_namespace = None
+            if self.response_cache and self._is_context_free(session_id, user_text):
+                cache_namespace = (self.rag.kb_version, self.llm.get_system_prompt_template().version)
+            
+            # Retrieval and memory updates don't depend on the intent; start them right away
+            turn.start('retrieval', self._retrieve, user_text, cache_namespace, turn.cancel_event('retrieval'))
+            turn.start('memory', self._record_user_message, session_id, user_text)
+            
             # Recognize intent
-            intent, confidence, entities = self.intent_recognizer.recognize_intent(user_text)
+            intent, confidence, entities = turn.run('intent', self.intent_recognizer.recognize_intent, user_text)
             
-            # Add to memory
-            self.memory.add_message(session_id, 'user', user_text)
+            # Get conversation context
+            context = turn.result('memory')
+            conversation_history = context['conversation_history']
             self.memory.add_intent(session_id, intent, confidence, entities)
             
             # Update user profile with extracted entities
             if entities:
                 self.memory.update_user_profile(session_id, entities)
             
-            # Get conversation context
-            context = self.memory.get_context_for_llm(session_id)
-            conversation_history = context['conversation_history']
-            
             # Check if we should escalate to human
             should_escalate = self.intent_recognizer.should_escalate_to_human(
                 intent, confidence, conversation_history
             )
             
             if should_escalate:
+                turn.cancel('retrieval')
                 response_text = self.intent_recognizer.generate_escalation_message(intent, entities)
             else:
-                # Get relevant context from RAG
-                rag_context = self.rag.get_context(user_text) if self.rag.documents else ""
+                retrieval = turn.result('retrieval')
+                response_text = retrieval['cached_response']
                 
-                # Generate response using LLM
-                response_text = self.llm.generate_response(
-                    user_message=user_text,
-                    context=rag_context,
-                    conversation_history=conversation_history
-                )
+                if response_text is None:
+                    # Generate response using LLM; the handler fits the chunks to its token budget
+                    response_text = turn.run(
+                        'llm',
+                        self.llm.generate_response,
+                        user_message=user_text,
+                        context=retrieval['chunks'],
+                        conversation_history=conversation_history,
+                        summary=context['context_summary']
+                    )
+                    
+                    if cache_namespace is not None and response_text != self.llm.FALLBACK_RESPONSE:
+                        self.response_cache.store(user_text, response_text, cache_namespace)
             
             # Add response to memory
             self.memory.add_message(session_id, 'assistant', response_text)
             
             # Generate audio response
-            audio_response = self.tts.text_to_speech(response_text)
+            audio_response = turn.run('tts', self.tts.text_to_speech, response_text)
             
             print(f"Assistant: {response_text}")
             
+            # Fold any evicted turns into the summary after this turn's response is ready
+            self.memory.schedule_summary(session_id)
+            
             return {
                 'success': True,
                 'user_text': user_text,
@@ -125,11 +162,12 @@ class VoiceAssistant:
                 'confidence': confidence,
                 'entities': entities,
                 'should_escalate': should_escalate,
-                'session_id': session_id
+                'session_id': session_id,
+                'timings': turn.report()
             }
             
         except Exception as e:
-            error_message = "I apologize, but I'm experiencing some technical difficulties. Please try again."
+            error_message = self.TECHNICAL_ERROR_MESSAGE
             return {
                 'success': False,
                 'error': str(e),
@@ -137,6 +175,27 @@ class VoiceAssistant:
                 'audio_response': self.tts.text_to_speech(error_message)
             }
     
+    def _is_context_free(self, session_id: str, user_text: str) -> bool:
+        """Whether the answer can depend only on the question (checked before the turn touches memory)"""
+        return not self.memory.has_context(session_id) and not self.intent_recognizer.extract_entities(user_text)
+    
+    def _retrieve(self, user_text: str, cache_namespace: tuple, cancel_event) -> Dict:
+        """Look up a cached answer (context-free turns only), else get ranked chunks from RAG (turn stage)"""
+        # Each step encodes the question, so check for cancellation before starting either one
+        cached_response = None
+        if cache_namespace is not None and not cancel_event.is_set():
+            cached_response = self.response_cache.lookup(user_text, cache_namespace)
+        if cached_response is not None or cancel_event.is_set():
+            return {'cached_response': cached_response, 'chunks': []}
+        
+        chunks = self.rag.get_context_chunks(user_text) if self.rag.documents else []
+        return {'cached_response': None, 'chunks': chunks}
+    
+    def _record_user_message(self, session_id: str, user_text: str) -> Dict:
+        """Store the user message and assemble the LLM context (turn stage)"""
+        self.memory.add_message(session_id, 'user', user_text)
+        return self.memory.get_context_for_llm(session_id)
+    
     def start_new_session(self) -> str:
         """Start a new conversation session"""
         session_id = str(uuid.uuid4())
@@ -159,6 +218,10 @@ class VoiceAssistant:
         """Get statistics about the knowledge base"""
         return self.rag.get_statistics()
     
+    def get_response_cache_stats(self) -> Dict:
+        """Get semantic response cache hit-rate metrics"""
+        return self.response_cache.get_statistics() if self.response_cache else {}
+    
     def save_knowledge_base(self, path: str = None):
         """Save the knowledge base index"""
         if path is None:
@@ -0,0 +1,168 @@
+import io
+import math
+import subprocess
+import threading
+import wave
+import numpy as np
+
+# Whisper models expect mono float32 audio sampled at 16 kHz
+WHISPER_SAMPLE_RATE = 16000
+
+# Anti-aliasing filter: input samples on each side of the centre, Kaiser beta, and the
+# cutoff as a fraction of the lower Nyquist frequency (the rest is the transition band)
+RESAMPLE_HALF_WIDTH = 64
+RESAMPLE_KAISER_BETA = 8.6
+RESAMPLE_ROLLOFF = 0.9
+# Output samples computed per vectorized block, bounding temporary memory
+RESAMPLE_BLOCK_SIZE = 8192
+
+class Resampler:
+    """Polyphase windowed-sinc resampler that carries filter state across calls
+
+    Feeding a stream chunk by chunk gives the same output as resampling it in one
+    piece, so there are no seams at chunk edges. Output lags input by
+    RESAMPLE_HALF_WIDTH input samples; flush() returns the remainder.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int):
+        divisor = math.gcd(source_rate, target_rate)
+        self.up = target_rate // divisor
+        self.down = source_rate // divisor
+        self.source_rate = source_rate
+        self.target_rate = target_rate
+
+        # Low-pass prototype at the upsampled rate, cutting below the lower of the two Nyquist rates
+        half = RESAMPLE_HALF_WIDTH
+        cutoff = RESAMPLE_ROLLOFF / max(self.up, self.down)
+        n = np.arange(2 * half * self.up + 1) - half * self.up
+        taps = cutoff * np.sinc(cutoff * n) * np.kaiser(len(n), RESAMPLE_KAISER_BETA) * self.up
+
+        # Phase p holds taps p, p + up, ...; reversed so a window of input samples can be dotted directly
+        self.width = 2 * half + 1
+        taps = np.concatenate([taps, np.zeros(self.width * self.up - len(taps))])
+        self._phases = taps.reshape(self.width, self.up).T[:, ::-1].astype(np.float32)
+
+        self._history = np.zeros(self.width - 1, dtype=np.float32)
+        # Next output position in upsampled units, relative to the start of _history
+        self._position = (self.width - 1 + half) * self.up
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """Resample the next chunk of the stream"""
+        buffer = np.concatenate([self._history, np.asarray(audio, dtype=np.float32)])
+        count = max(0, -(-(len(buffer) * self.up - self._position) // self.down))
+        positions = self._position + self.down * np.arange(count, dtype=np.int64)
+
+        output = np.empty(count, dtype=np.float32)
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, self.width) if count else None
+        for start in range(0, count, RESAMPLE_BLOCK_SIZE):
+            block = positions[start:start + RESAMPLE_BLOCK_SIZE]
+            rows = windows[block // self.up - (self.width - 1)]
+            output[start:start + len(block)] = np.einsum('ij,ij->i', rows, self._phases[block % self.up])
+
+        consumed = len(buffer) - (self.width - 1)
+        self._history = buffer[consumed:].copy()
+        self._position += self.down * count - consumed * self.up
+        return output
+
+    def flush(self) -> np.ndarray:
+        """Return the output still held back by the filter delay"""
+        return self.process(np.zeros(RESAMPLE_HALF_WIDTH, dtype=np.float32))
+
+    def resample(self, audio: np.ndarray) -> np.ndarray:
+        """Resample a complete clip (this resampler must be unused)"""
+        target_length = int(round(len(audio) * self.target_rate / self.source_rate))
+        output = np.concatenate([self.process(audio), self.flush()])
+        return output[:target_length]
+
+
+class AudioDecoder:
+    """Decode WAV, raw PCM and compressed audio bytes to float32 arrays in memory"""
+
+    def __init__(self, sample_rate: int = WHISPER_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        # One scratch buffer per thread, so sessions sharing a decoder don't overwrite each other
+        self._local = threading.local()
+
+    def decode(self, audio_data: bytes, format_hint: str = None, copy: bool = False) -> np.ndarray:
+        """Decode audio bytes of any supported format to mono float32 at the target rate
+
+        Unless copy is True the returned array is a view into a buffer that is
+        reused by the next decode call on this instance from the same thread.
+        """
+        if format_hint in (None, 'wav') and audio_data[:4] == b'RIFF' and audio_data[8:12] == b'WAVE':
+            try:
+                return self.decode_wav(audio_data, copy=copy)
+            except wave.Error:
+                # Non-PCM WAV (e.g. float or compressed); let ffmpeg handle it
+                pass
+        return self.decode_with_ffmpeg(audio_data, format_hint, copy=copy)
+
+    def decode_wav(self, wav_data: bytes, copy: bool = False) -> np.ndarray:
+        """Decode PCM WAV bytes without touching the filesystem"""
+        with wave.open(io.BytesIO(wav_data), 'rb') as wav_file:
+            channels = wav_file.getnchannels()
+            sample_width = wav_file.getsampwidth()
+            sample_rate = wav_file.getframerate()
+            pcm_data = wav_file.readframes(wav_file.getnframes())
+        return self.decode_pcm(pcm_data, sample_rate, sample_width, channels, copy=copy)
+
+    def decode_pcm(self, pcm_data: bytes, sample_rate: int, sample_width: int = 2,
+                   channels: int = 1, copy: bool = False, resampler: Resampler = None) -> np.ndarray:
+        """Convert interleaved little-endian PCM bytes to mono float32 at the target rate
+
+        Pass the same resampler for every chunk of a stream so filtering continues
+        across chunk boundaries; the result is then always a new array.
+        """
+        if sample_width == 1:
+            samples = np.frombuffer(pcm_data, dtype=np.uint8)
+            offset, scale = 128.0, 1.0 / 128.0
+        elif sample_width == 2:
+            samples = np.frombuffer(pcm_data, dtype='<i2')
+            offset, scale = 0.0, 1.0 / 32768.0
+        elif sample_width == 4:
+            samples = np.frombuffer(pcm_data, dtype='<i4')
+            offset, scale = 0.0, 1.0 / 2147483648.0
+        else:
+            raise ValueError(f"Unsupported PCM sample width: {sample_width}")
+
+        if channels > 1:
+            frame_count = len(samples) // channels
+            samples = samples[:frame_count * channels].reshape(frame_count, channels).mean(axis=1)
+
+        audio = self._scratch(len(samples))
+        np.subtract(samples, np.float32(offset), out=audio, casting='unsafe')
+        audio *= np.float32(scale)
+
+        if resampler is not None:
+            return resampler.process(audio)
+        if sample_rate != self.sample_rate:
+            audio = Resampler(sample_rate, self.sample_rate).resample(audio)
+
+        return audio.copy() if copy else audio
+
+    def decode_with_ffmpeg(self, audio_data: bytes, format_hint: str = None, copy: bool = False) -> np.ndarray:
+        """Decode compressed audio (WebM, MP3, ...) by piping it through ffmpeg"""
+        command = ["ffmpeg", "-nostdin", "-threads", "0"]
+        if format_hint:
+            command += ["-f", format_hint]
+        command += [
+            "-i", "pipe:0",
+            "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le",
+            "-ar", str(self.sample_rate),
+            "pipe:1"
+        ]
+
+        process = subprocess.run(command, input=audio_data, capture_output=True)
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed to decode audio: {process.stderr.decode(errors='ignore').strip()}")
+
+        return self.decode_pcm(process.stdout, self.sample_rate, copy=copy)
+
+    def _scratch(self, length: int) -> np.ndarray:
+        """Return a float32 view of this thread's reusable buffer with the given length"""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None or buffer.shape[0] < length:
+            # Grow geometrically so a session's utterances settle on one allocation
+            buffer = np.empty(max(length, 2 * (buffer.shape[0] if buffer is not None else 0)), dtype=np.float32)
+            self._local.buffer = buffer
+        return buffer[:length]
@@ -0,0 +1,151 @@
+import io
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict
+import pygame
+
+# Marks the end of a handle's chunk stream
+_END_OF_STREAM = object()
+
+class PlaybackHandle:
+    """Handle for audio queued on an AudioPlayer"""
+
+    def __init__(self):
+        self._chunks = queue.Queue()
+        self._done = threading.Event()
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._queued_seconds = 0.0
+        self._played_seconds = 0.0
+        self._current_started = None
+
+    def add_chunk(self, audio_data: bytes, pcm: bool = False):
+        """Queue another chunk; pcm=True for raw samples in the mixer's format"""
+        self._chunks.put((audio_data, pcm))
+
+    def close(self):
+        """Mark that no more chunks will be added"""
+        self._chunks.put(_END_OF_STREAM)
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until playback finishes or is cancelled; False on timeout"""
+        return self._done.wait(timeout)
+
+    def cancel(self):
+        """Stop playback and drop any chunks not yet played"""
+        self._cancelled.set()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def progress(self) -> Dict:
+        """Seconds played so far against seconds decoded and queued"""
+        with self._lock:
+            played = self._played_seconds
+            if self._current_started is not None:
+                played += time.monotonic() - self._current_started
+            queued = self._queued_seconds
+        played = min(played, queued)
+        return {
+            'played_seconds': played,
+            'queued_seconds': queued,
+            'fraction': played / queued if queued else 0.0,
+            'done': self.done
+        }
+
+
+class AudioPlayer:
+    """Play in-memory audio on a background thread with gapless chunk queueing"""
+
+    def __init__(self, poll_interval: float = 0.02):
+        self.poll_interval = poll_interval
+        self._handles = queue.Queue()
+        self._channel = pygame.mixer.Channel(0)
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def play(self, audio_data: bytes, pcm: bool = False) -> PlaybackHandle:
+        """Queue a complete clip and return its handle immediately"""
+        handle = self.open_stream()
+        handle.add_chunk(audio_data, pcm)
+        handle.close()
+        return handle
+
+    def open_stream(self) -> PlaybackHandle:
+        """Return a handle whose chunks play back to back as they are added"""
+        handle = PlaybackHandle()
+        self._handles.put(handle)
+        return handle
+
+    def _run(self):
+        """Play queued handles one after another"""
+        while True:
+            handle = self._handles.get()
+            try:
+                self._play_handle(handle)
+            except Exception as e:
+                print(f"Error playing audio: {e}")
+                self._channel.stop()
+            finally:
+                handle._done.set()
+
+    def _play_handle(self, handle: PlaybackHandle):
+        """Feed a handle's chunks to the mixer channel, keeping the next one queued"""
+        lengths = deque()  # lengths of sounds started or queued on the channel, oldest first
+        exhausted = False
+
+        while True:
+            if handle.cancelled:
+                self._channel.stop()
+                return
+
+            busy = self._channel.get_busy()
+            queued = self._channel.get_queue() is not None
+
+            # A sound finished (or the queued one took over): account for it
+            while len(lengths) > (int(busy) + int(queued)):
+                with handle._lock:
+                    handle._played_seconds += lengths.popleft()
+                    handle._current_started = time.monotonic() if busy else None
+
+            # Keep exactly one decoded sound waiting behind the current one
+            if not exhausted and not queued:
+                try:
+                    item = handle._chunks.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    continue
+
+                if item is _END_OF_STREAM:
+                    exhausted = True
+                else:
+                    sound = self._load_sound(*item)
+                    lengths.append(sound.get_length())
+                    with handle._lock:
+                        handle._queued_seconds += sound.get_length()
+                        if not busy:
+                            handle._current_started = time.monotonic()
+
+                    if busy:
+                        self._channel.queue(sound)
+                    else:
+                        self._channel.play(sound)
+                continue
+
+            if exhausted and not lengths:
+                return
+
+            time.sleep(self.poll_interval)
+
+    def _load_sound(self, audio_data: bytes, pcm: bool) -> pygame.mixer.Sound:
+        """Decode a chunk from memory"""
+        if pcm:
+            return pygame.mixer.Sound(buffer=audio_data)
+        return pygame.mixer.Sound(file=io.BytesIO(audio_data))
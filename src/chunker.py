@@ -0,0 +1,76 @@
+from collections import deque
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Tuple
+from src.text_segmenter import iter_sentences
+
+# Large inputs are fed to the sentence segmenter in slices of this many characters
+PIECE_SIZE = 1 << 16
+# Sentences whose tokens are counted in one tokenizer call
+COUNT_BATCH_SIZE = 256
+# Rough characters per token, used to cut sentences that never end
+CHARS_PER_TOKEN = 4
+
+class TokenChunker:
+    """Pack sentences into chunks of at most max_tokens tokens, overlapping by up to overlap_tokens
+
+    Text arrives as an iterable of pieces and is split into sentences in one pass;
+    only the current chunk and one segmenter buffer are held in memory, however large
+    the input. Sentences longer than a whole chunk are split between words.
+    """
+
+    def __init__(self, count_tokens: Callable[[List[str]], List[int]], max_tokens: int, overlap_tokens: int = 0):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        self.count_tokens = count_tokens
+        self.max_tokens = max_tokens
+        self.overlap_tokens = min(overlap_tokens, max_tokens // 2)
+
+    def chunks(self, pieces: Iterable[str]) -> Iterator[str]:
+        """Yield chunk texts as soon as each one is full"""
+        window = deque()  # (sentence, tokens) making up the current chunk
+        window_tokens = 0
+        fresh = False  # whether the window holds sentences not yet yielded
+
+        for sentence, tokens in self._counted_sentences(pieces):
+            if window_tokens + tokens > self.max_tokens:
+                if fresh:
+                    yield " ".join(text for text, _ in window)
+                    fresh = False
+                # Keep the tail of the last chunk as overlap, as far as the new sentence allows
+                while window and (window_tokens > self.overlap_tokens or window_tokens + tokens > self.max_tokens):
+                    window_tokens -= window.popleft()[1]
+
+            window.append((sentence, tokens))
+            window_tokens += tokens
+            fresh = True
+
+        if fresh:
+            yield " ".join(text for text, _ in window)
+
+    def _counted_sentences(self, pieces: Iterable[str]) -> Iterator[Tuple[str, int]]:
+        """Sentences no longer than max_tokens, with their token counts"""
+        sentences = iter_sentences(self._slices(pieces), max_length=self.max_tokens * CHARS_PER_TOKEN)
+        while True:
+            batch = list(islice(sentences, COUNT_BATCH_SIZE))
+            if not batch:
+                return
+            for sentence, tokens in zip(batch, self.count_tokens(batch)):
+                yield from self._fit(sentence, tokens)
+
+    def _fit(self, sentence: str, tokens: int) -> Iterator[Tuple[str, int]]:
+        """Split a sentence in half between words until every part fits in a chunk"""
+        words = sentence.split()
+        if tokens <= self.max_tokens or len(words) < 2:
+            yield sentence, tokens
+            return
+
+        middle = len(words) // 2
+        halves = [" ".join(words[:middle]), " ".join(words[middle:])]
+        for half, half_tokens in zip(halves, self.count_tokens(halves)):
+            yield from self._fit(half, half_tokens)
+
+    @staticmethod
+    def _slices(pieces: Iterable[str]) -> Iterator[str]:
+        for piece in pieces:
+            for start in range(0, len(piece), PIECE_SIZE):
+                yield piece[start:start + PIECE_SIZE]
@@ -0,0 +1,131 @@
+import hashlib
+import sys
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, List
+import numpy as np
+
+HASH_SIZE = 40  # hex SHA-1
+
+def content_hash(content: str) -> str:
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+
+class DocumentStore(Sequence):
+    """Columnar chunk storage; rows are materialized as dicts only when accessed
+
+    Rows can come from a memory-mapped chunk table and text file (see kb_storage)
+    followed by rows appended in memory.
+    """
+
+    __slots__ = (
+        '_sources', '_source_lookup',
+        '_mapped_chunks', '_mapped_texts', '_mapped_count',
+        '_contents', '_source_ids', '_chunk_ids', '_word_counts', '_hashes'
+    )
+
+    def __init__(self, documents: Iterable[Dict] = ()):
+        self._sources: List[str] = []
+        self._source_lookup: Dict[str, int] = {}
+        self._mapped_chunks = None
+        self._mapped_texts = None
+        self._mapped_count = 0
+        self._contents: List[str] = []
+        self._source_ids = array('i')
+        self._chunk_ids = array('i')
+        self._word_counts = array('i')
+        self._hashes = bytearray()  # fixed-width ASCII hex digests
+        for document in documents:
+            self.append(document)
+
+    @classmethod
+    def from_mapped(cls, chunks: np.ndarray, texts: np.ndarray, sources: List[str]) -> 'DocumentStore':
+        """Wrap a memory-mapped chunk table and text store without reading them"""
+        store = cls()
+        store._mapped_chunks = chunks
+        store._mapped_texts = texts
+        store._mapped_count = len(chunks)
+        store._sources = list(sources)
+        store._source_lookup = {source: i for i, source in enumerate(store._sources)}
+        return store
+
+    def __len__(self) -> int:
+        return self._mapped_count + len(self._contents)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("document index out of range")
+
+        if i < self._mapped_count:
+            row = self._mapped_chunks[i]
+            return {
+                'content': self.content(i),
+                'source': self._sources[row['source']],
+                'chunk_id': int(row['chunk_id']),
+                'word_count': int(row['word_count']),
+                'content_hash': row['content_hash'].decode('ascii')
+            }
+
+        j = i - self._mapped_count
+        return {
+            'content': self._contents[j],
+            'source': self._sources[self._source_ids[j]],
+            'chunk_id': self._chunk_ids[j],
+            'word_count': self._word_counts[j],
+            'content_hash': self._hashes[j * HASH_SIZE:(j + 1) * HASH_SIZE].decode('ascii')
+        }
+
+    def append(self, document: Dict):
+        source = document['source']
+        source_id = self._source_lookup.get(source)
+        if source_id is None:
+            source_id = self._source_lookup[source] = len(self._sources)
+            self._sources.append(source)
+
+        self._contents.append(document['content'])
+        self._source_ids.append(source_id)
+        self._chunk_ids.append(document['chunk_id'])
+        self._word_counts.append(document['word_count'])
+        self._hashes += (document.get('content_hash') or content_hash(document['content'])).encode('ascii')
+
+    def content(self, i: int) -> str:
+        """Chunk text without building the whole row"""
+        if i < self._mapped_count:
+            row = self._mapped_chunks[i]
+            offset, length = int(row['offset']), int(row['length'])
+            return self._mapped_texts[offset:offset + length].tobytes().decode('utf-8')
+        return self._contents[i - self._mapped_count]
+
+    def column(self, key: str) -> List:
+        """One field for every document, without decoding chunk contents where avoidable"""
+        if key == 'source':
+            ids = self._mapped_chunks['source'].tolist() if self._mapped_count else []
+            return [self._sources[i] for i in ids + self._source_ids.tolist()]
+        if key == 'content_hash':
+            mapped = [h.decode('ascii') for h in self._mapped_chunks['content_hash'].tolist()] if self._mapped_count else []
+            return mapped + [self._hashes[j:j + HASH_SIZE].decode('ascii')
+                             for j in range(0, len(self._hashes), HASH_SIZE)]
+        if key in ('chunk_id', 'word_count'):
+            mapped = self._mapped_chunks[key].tolist() if self._mapped_count else []
+            return mapped + getattr(self, f"_{key}s").tolist()
+        if key == 'content':
+            return [self.content(i) for i in range(len(self))]
+        raise KeyError(key)
+
+    def take(self, ids: Iterable[int]) -> 'DocumentStore':
+        """New in-memory store with the given rows, in order"""
+        return DocumentStore(self[i] for i in ids)
+
+    def memory_usage(self) -> Dict:
+        """Bytes held privately by this process and bytes mapped from shared files"""
+        resident = sum(sys.getsizeof(content) for content in self._contents)
+        resident += sum(sys.getsizeof(source) for source in self._sources)
+        resident += len(self._hashes) + sum(
+            column.itemsize * len(column) for column in (self._source_ids, self._chunk_ids, self._word_counts)
+        )
+        mapped = self._mapped_chunks.nbytes + self._mapped_texts.nbytes if self._mapped_count else 0
+        return {'resident': resident, 'mapped': mapped}
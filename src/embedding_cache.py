@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+import numpy as np
+from config import Config
+
+class EmbeddingCache:
+    """Bounded LRU cache of query text to float32 embedding"""
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or Config.QUERY_EMBEDDING_CACHE_SIZE
+        self._entries = OrderedDict()  # key -> read-only embedding, least recently used first
+        self._owner: Optional[Hashable] = None  # model the cached vectors came from
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def bind(self, owner: Hashable):
+        """Drop every entry if the embeddings would now come from a different model"""
+        with self._lock:
+            if owner is not self._owner:
+                if self._entries:
+                    self._stats['invalidations'] += 1
+                self._entries.clear()
+                self._owner = owner
+
+    def get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """Look up several keys, counting hits and misses"""
+        found = []
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is None:
+                    self._stats['misses'] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                found.append(vector)
+        return found
+
+    def put_many(self, keys: List[str], vectors: np.ndarray):
+        """Store one embedding row per key"""
+        with self._lock:
+            for key, vector in zip(keys, vectors):
+                vector = np.array(vector, dtype=np.float32)
+                vector.setflags(write=False)
+                self._entries[key] = vector
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get_statistics(self) -> Dict:
+        """Get hit-rate metrics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
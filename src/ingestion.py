@@ -0,0 +1,177 @@
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from itertools import groupby
+from typing import Dict, Iterable, Iterator, List, Tuple
+from urllib.parse import urlparse
+import PyPDF2
+from config import Config
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) of a PDF; runs in a worker process"""
+    with open(pdf_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        return [f"{pdf_reader.pages[i].extract_text() or ''}\n" for i in range(start, stop)]
+
+def _count_pages(pdf_path: str) -> int:
+    with open(pdf_path, 'rb') as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+
+class IngestionPipeline:
+    """Bulk loading of URLs and PDFs into a RAGEngine
+
+    URLs are fetched on a thread pool through the engine's pooled session, with at
+    most per_host_limit requests to one host at a time. PDF pages are extracted in
+    worker processes, a few tasks ahead of the consumer, and streamed in page order
+    into the chunker. Chunks are embedded every batch_size chunks, so the embedder runs
+    while later sources are still being fetched and extracted. When the engine has no
+    index yet, it is built once at the end so index training sees the whole corpus.
+    """
+
+    def __init__(self, rag, fetch_workers: int = None, per_host_limit: int = None, pdf_workers: int = None,
+                 pages_per_task: int = None, batch_size: int = None):
+        self.rag = rag
+        self.fetch_workers = fetch_workers or Config.INGEST_FETCH_WORKERS
+        self.per_host_limit = per_host_limit or Config.INGEST_PER_HOST_LIMIT
+        self.pdf_workers = pdf_workers or Config.INGEST_PDF_WORKERS or os.cpu_count() or 1
+        self.pages_per_task = pages_per_task or Config.INGEST_PDF_PAGES_PER_TASK
+        self.batch_size = batch_size or Config.INGEST_EMBED_BATCH_SIZE
+
+        self._host_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+        self._pending: List[Dict] = []
+        self._failed_sources = set()
+        self._defer_index = False
+        self._stats = {}
+
+    def run(self, urls: List[str], pdf_paths: List[str]) -> Dict:
+        """Ingest every source and return throughput statistics"""
+        start = time.perf_counter()
+        self._stats = {'sources': 0, 'pages': 0, 'chunks': 0, 'chunks_added': 0}
+        self._failed_sources = set()
+        # Training an index on the first batch alone would leave it degenerate
+        self._defer_index = self.rag.index is None
+
+        # Spawned, not forked: this process already runs fetch threads and torch/faiss pools
+        pdf_context = ProcessPoolExecutor(
+            self.pdf_workers, mp_context=multiprocessing.get_context("spawn")
+        ) if pdf_paths else nullcontext()
+        with ThreadPoolExecutor(self.fetch_workers, thread_name_prefix='ingest-fetch') as fetch_pool, \
+                pdf_context as pdf_pool:
+            # Fetches run in the background while PDFs are chunked and embedded here
+            fetches = {fetch_pool.submit(self._fetch, url): url for url in urls}
+
+            if pdf_paths:
+                for pdf_path, ranges in groupby(self._extract_pages(pdf_pool, pdf_paths), key=lambda item: item[0]):
+                    self._ingest_source(pdf_path, self._pages(future for _, future in ranges))
+
+            for future in as_completed(fetches):
+                url = fetches[future]
+                content = future.result()
+                if content:
+                    self._stats['pages'] += 1
+                self._ingest_source(url, [content] if content else [])
+
+        self._flush()
+        try:
+            self.rag.update_index()
+            self.rag.optimize_index()
+        except Exception as e:
+            print(f"Error building index: {e}")
+            index_error = str(e)
+        else:
+            index_error = None
+
+        seconds = time.perf_counter() - start
+        stats = dict(self._stats)
+        stats['sources_failed'] = len(self._failed_sources)
+        stats['sources_ok'] = stats.pop('sources') - stats['sources_failed']
+        stats['index_error'] = index_error
+        stats['seconds'] = seconds
+        stats['pages_per_second'] = stats['pages'] / seconds if seconds else 0.0
+        stats['chunks_per_second'] = stats['chunks'] / seconds if seconds else 0.0
+        return stats
+
+    def _fetch(self, url: str) -> str:
+        host = urlparse(url).netloc
+        with self._host_lock:
+            limit = self._host_limits.setdefault(host, threading.BoundedSemaphore(self.per_host_limit))
+        with limit:
+            return self.rag.scrape_website(url)
+
+    def _page_tasks(self, pdf_paths: List[str]) -> Iterator[Tuple[str, int, int]]:
+        """(pdf_path, start, stop) page ranges, in document order"""
+        for pdf_path in pdf_paths:
+            print(f"Processing PDF: {pdf_path}")
+            try:
+                page_count = _count_pages(pdf_path)
+            except Exception as e:
+                print(f"Error extracting PDF text: {e}")
+                self._stats['sources'] += 1
+                self._failed_sources.add(pdf_path)
+                continue
+            for start in range(0, page_count, self.pages_per_task):
+                yield pdf_path, start, min(start + self.pages_per_task, page_count)
+
+    def _extract_pages(self, pool: ProcessPoolExecutor, pdf_paths: List[str]) -> Iterator[Tuple[str, Future]]:
+        """Submit page ranges to the pool, keeping a bounded number in flight, and yield them in order"""
+        tasks = self._page_tasks(pdf_paths)
+        in_flight = deque()
+        for task in tasks:
+            in_flight.append((task[0], pool.submit(_extract_page_range, *task)))
+            if len(in_flight) < 2 * self.pdf_workers:
+                continue
+            yield in_flight.popleft()
+        while in_flight:
+            yield in_flight.popleft()
+
+    def _pages(self, futures: Iterable[Future]) -> Iterator[str]:
+        for future in futures:
+            pages = future.result()
+            self._stats['pages'] += len(pages)
+            yield from pages
+
+    def _ingest_source(self, source: str, pieces: Iterable[str]):
+        """Chunk a source into the pending batch, then drop its chunks that no longer exist"""
+        self._stats['sources'] += 1
+        hashes = set()
+        try:
+            for doc in self.rag.iter_document_chunks(pieces, source):
+                hashes.add(doc['content_hash'])
+                self._pending.append(doc)
+                self._stats['chunks'] += 1
+                if len(self._pending) >= self.batch_size:
+                    self._flush()
+        except Exception as e:
+            print(f"Error ingesting {source}: {e}")
+            self._failed_sources.add(source)
+            return
+
+        if not hashes:
+            print(f"No content extracted from {source}")
+            self._failed_sources.add(source)
+            return
+
+        # Only a complete source can tell which of its old chunks went away
+        self.rag.remove_stale_chunks(source, hashes)
+
+    def _flush(self):
+        """Embed the pending chunks, adding them to the index unless it is built at the end"""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            self._stats['chunks_added'] += self.rag.append_chunks(pending)
+            if self._defer_index:
+                self.rag.embed_new_chunks()
+            else:
+                self.rag.update_index()
+        except Exception as e:
+            # Appended chunks stay unindexed; the final update_index() retries them
+            print(f"Error indexing {len(pending)} chunks: {e}")
+            self._failed_sources.update(doc['source'] for doc in pending)
@@ -200,6 +200,19 @@ class IntentRecognizer:
         else:
             return "It sounds like you might benefit from speaking with one of our team members directly. Could you provide your name and email, and I'll have someone reach out to you?"
     
+    def get_static_escalation_messages(self) -> List[str]:
+        """Get every fixed message generate_escalation_message can return"""
+        # Only the presence of an email or phone changes the wording, never their values
+        entity_variants = [{}, {'email': True}, {'phone': True}]
+        intents = list(self.intent_patterns) + ['unknown']
+        
+        messages = {
+            self.generate_escalation_message(intent, entities)
+            for intent in intents
+            for entities in entity_variants
+        }
+        return sorted(messages)
+    
     def extract_scheduling_preferences(self, text: str) -> Dict:
         """Extract scheduling preferences from text"""
         preferences = {}
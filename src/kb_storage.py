@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import time
+from collections.abc import Sequence
+from typing import Dict, List, Optional, Tuple
+import faiss
+import numpy as np
+from config import Config
+from src.document_store import DocumentStore, content_hash
+
+FORMAT_NAME = "ai_voice_chat.knowledge_base"
+FORMAT_VERSION = 1
+
+# One fixed-size row per chunk; contents live in the text store at [offset, offset + length)
+CHUNK_DTYPE = np.dtype([
+    ('offset', '<i8'),
+    ('length', '<i8'),
+    ('source', '<i4'),  # index into the metadata 'sources' list
+    ('chunk_id', '<i4'),
+    ('word_count', '<i4'),
+    ('content_hash', 'S40')
+])
+
+class KnowledgeBaseFormatError(Exception):
+    """Raised when saved knowledge-base files are missing, mismatched or corrupt"""
+
+
+def storage_paths(path: str) -> Dict[str, str]:
+    """File names making up a saved knowledge base"""
+    return {
+        'meta': f"{path}.meta.json",
+        'index': f"{path}.faiss",
+        'embeddings': f"{path}.embeddings.npy",
+        'chunks': f"{path}.chunks.npy",
+        'texts': f"{path}.texts.bin"
+    }
+
+def exists(path: str) -> bool:
+    """Whether a knowledge base in this format is saved at path"""
+    return os.path.exists(storage_paths(path)['meta'])
+
+
+def save(path: str, index: faiss.Index, documents: Sequence, embeddings: Optional[np.ndarray],
+         deleted_ids: List[int] = (), embedding_dtype: str = None):
+    """Write the knowledge base; the metadata file goes last so partial saves are never loaded
+
+    embeddings may be None when the vectors live only in the index (lean mode).
+    """
+    embedding_dtype = embedding_dtype or Config.KB_EMBEDDING_DTYPE
+    if embedding_dtype not in ('float32', 'float16'):
+        raise ValueError(f"Unsupported embedding dtype: {embedding_dtype}")
+
+    paths = storage_paths(path)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    # Text store plus fixed-size chunk table
+    sources: Dict[str, int] = {}
+    chunks = np.zeros(len(documents), dtype=CHUNK_DTYPE)
+    offset = 0
+    with open(paths['texts'] + '.tmp', 'wb') as f:
+        for i, doc in enumerate(documents):
+            data = doc['content'].encode('utf-8')
+            f.write(data)
+            digest = doc.get('content_hash') or content_hash(doc['content'])
+            chunks[i] = (offset, len(data), sources.setdefault(doc['source'], len(sources)),
+                         doc['chunk_id'], doc['word_count'], digest.encode('ascii'))
+            offset += len(data)
+
+    if embeddings is None:
+        del paths['embeddings']
+    else:
+        np.save(paths['embeddings'] + '.tmp.npy', np.ascontiguousarray(embeddings, dtype=embedding_dtype))
+    np.save(paths['chunks'] + '.tmp.npy', chunks)
+    faiss.write_index(index, paths['index'] + '.tmp')
+
+    os.replace(paths['texts'] + '.tmp', paths['texts'])
+    os.replace(paths['chunks'] + '.tmp.npy', paths['chunks'])
+    if embeddings is not None:
+        os.replace(paths['embeddings'] + '.tmp.npy', paths['embeddings'])
+    os.replace(paths['index'] + '.tmp', paths['index'])
+
+    meta = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'embedding_model': Config.EMBEDDING_MODEL,
+        'embedding_dtype': embedding_dtype if embeddings is not None else None,
+        'count': len(documents),
+        'dimension': int(index.d),
+        'sources': list(sources),
+        'deleted_ids': sorted(int(i) for i in deleted_ids),
+        'files': {
+            name: {'bytes': os.path.getsize(file_path), 'sha256': _sha256(file_path)}
+            for name, file_path in paths.items() if name != 'meta'
+        }
+    }
+    with open(paths['meta'] + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(paths['meta'] + '.tmp', paths['meta'])
+
+def load(path: str, verify: bool = None,
+         load_embeddings: bool = True) -> Tuple[faiss.Index, DocumentStore, Optional[np.ndarray], Dict, bool]:
+    """Open a saved knowledge base with memory maps
+
+    Returns (index, documents, embeddings, meta, index_read_only); embeddings is None
+    if none were saved or load_embeddings is off. File sizes are always checked;
+    full checksums only when verify is set (KB_VERIFY_CHECKSUMS).
+    """
+    verify = Config.KB_VERIFY_CHECKSUMS if verify is None else verify
+    paths = storage_paths(path)
+
+    with open(paths['meta'], 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('format') != FORMAT_NAME or meta.get('version', 0) > FORMAT_VERSION:
+        raise KnowledgeBaseFormatError(f"Unsupported knowledge base format in {paths['meta']}")
+    if meta['embedding_model'] != Config.EMBEDDING_MODEL:
+        raise KnowledgeBaseFormatError(
+            f"Knowledge base was embedded with {meta['embedding_model']}, not {Config.EMBEDDING_MODEL}"
+        )
+
+    for name, expected in meta['files'].items():
+        file_path = paths[name]
+        if not os.path.exists(file_path) or os.path.getsize(file_path) != expected['bytes']:
+            raise KnowledgeBaseFormatError(f"{file_path} is missing or has the wrong size")
+        if verify and _sha256(file_path) != expected['sha256']:
+            raise KnowledgeBaseFormatError(f"Checksum mismatch for {file_path}")
+
+    embeddings = None
+    if load_embeddings and 'embeddings' in meta['files']:
+        embeddings = np.load(paths['embeddings'], mmap_mode='r')
+        if embeddings.shape != (meta['count'], meta['dimension']):
+            raise KnowledgeBaseFormatError(f"{paths['embeddings']} doesn't match its metadata")
+
+    chunks = np.load(paths['chunks'], mmap_mode='r')
+    if meta['files']['texts']['bytes']:
+        texts = np.memmap(paths['texts'], dtype=np.uint8, mode='r')
+    else:
+        texts = np.zeros(0, dtype=np.uint8)  # empty files can't be mapped
+    if len(chunks) != meta['count']:
+        raise KnowledgeBaseFormatError(f"{paths['chunks']} doesn't match its metadata")
+
+    index, read_only = _read_index(paths['index'])
+    documents = DocumentStore.from_mapped(chunks, texts, meta['sources'])
+    return index, documents, embeddings, meta, read_only
+
+def _read_index(index_path: str) -> Tuple[faiss.Index, bool]:
+    """Map the index file where FAISS supports it, else read it into memory
+
+    Only IVF inverted lists are actually mapped; those are read-only, so the
+    second value tells the caller to rebuild before adding vectors.
+    """
+    try:
+        index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except (AttributeError, RuntimeError):
+        return faiss.read_index(index_path), False
+    return index, isinstance(index, faiss.IndexIVF)
+
+def _sha256(file_path: str, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
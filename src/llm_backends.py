@@ -0,0 +1,210 @@
+import asyncio
+import hashlib
+import json
+import time
+import weakref
+from typing import Dict, Iterator, List, Optional
+import httpx
+from config import Config
+
+# OpenAI-compatible chat completion endpoints per provider
+PROVIDER_BASE_URLS = {
+    'groq': 'https://api.groq.com/openai/v1',
+    'openai': 'https://api.openai.com/v1'
+}
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# One pooled async HTTP client for each event loop in the process
+_loop_clients = weakref.WeakKeyDictionary()
+
+class RetryableResponseError(Exception):
+    """Raised for HTTP responses that are worth retrying"""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(f"Retryable HTTP status {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _loop_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(Config.LLM_REQUEST_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=Config.LLM_POOL_CONNECTIONS,
+                max_keepalive_connections=Config.LLM_POOL_CONNECTIONS
+            )
+        )
+        _loop_clients[loop] = client
+    return client
+
+async def close_shared_client():
+    """Close the running loop's pooled HTTP client (call on shutdown)"""
+    client = _loop_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+class LLMBackend:
+    """Provider-specific chat completion transport used by LLMHandler"""
+
+    name = "base"
+
+    def __init__(self):
+        self.model = Config.LLM_MODEL
+        # Model for short utility calls (summaries, entity extraction, safety checks)
+        self.utility_model = self.model
+
+    def complete(self, messages: List[Dict], model: str = None, **params) -> str:
+        """Return the full completion text"""
+        raise NotImplementedError
+
+    def stream(self, messages: List[Dict], model: str = None, **params) -> Iterator[str]:
+        """Yield completion text deltas as they arrive; closing the iterator cancels the request"""
+        raise NotImplementedError
+
+    async def acomplete(self, messages: List[Dict], model: str = None, **params) -> str:
+        """Return the full completion text without blocking the event loop"""
+        return await asyncio.to_thread(self.complete, messages, model, **params)
+
+
+class ChatCompletionsBackend(LLMBackend):
+    """Backend for clients exposing the OpenAI-style client.chat.completions API
+
+    The async path posts to the same REST endpoint through the shared pooled httpx client.
+    """
+
+    def __init__(self, api_key: str):
+        super().__init__()
+        self.api_key = api_key
+        self.base_url = (Config.LLM_API_BASE_URL or PROVIDER_BASE_URLS[self.name]).rstrip('/')
+
+    def complete(self, messages: List[Dict], model: str = None, **params) -> str:
+        response = self.client.chat.completions.create(model=model or self.model, messages=messages, **params)
+        return response.choices[0].message.content
+
+    def stream(self, messages: List[Dict], model: str = None, **params) -> Iterator[str]:
+        stream = self.client.chat.completions.create(model=model or self.model, messages=messages, stream=True, **params)
+        try:
+            for chunk in stream:
+                token = chunk.choices[0].delta.content if chunk.choices else None
+                if token:
+                    yield token
+        finally:
+            # Closing the stream drops the HTTP connection so the server stops generating
+            stream.close()
+
+    async def acomplete(self, messages: List[Dict], model: str = None, **params) -> str:
+        response = await get_async_client().post(
+            f"{self.base_url}/chat/completions",
+            json={"model": model or self.model, "messages": messages, **params},
+            headers={"Authorization": f"Bearer {self.api_key}"}
+        )
+
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            retry_after = response.headers.get("retry-after")
+            raise RetryableResponseError(
+                response.status_code,
+                float(retry_after) if retry_after and retry_after.replace('.', '', 1).isdigit() else None
+            )
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+
+class GroqBackend(ChatCompletionsBackend):
+    name = "groq"
+
+    def __init__(self):
+        super().__init__(Config.GROQ_API_KEY)
+        from groq import Groq
+        self.client = Groq(api_key=self.api_key, base_url=Config.LLM_API_BASE_URL)
+
+
+class OpenAIBackend(ChatCompletionsBackend):
+    name = "openai"
+
+    def __init__(self):
+        super().__init__(Config.OPENAI_API_KEY)
+        from openai import OpenAI
+        self.client = OpenAI(api_key=self.api_key, base_url=Config.LLM_API_BASE_URL)
+        self.utility_model = "gpt-3.5-turbo"
+
+
+class LocalBackend(LLMBackend):
+    """Deterministic offline backend that simulates time to first token and tokens per second"""
+
+    name = "local"
+
+    # Canned sentences the replies are assembled from
+    SENTENCES = [
+        "Thanks for reaching out about that.",
+        "Based on our documentation, here is what I can tell you.",
+        "Our standard plan covers most common use cases.",
+        "You can change these settings at any time from your account page.",
+        "If you need more detail, I can connect you with our team.",
+        "Most requests like this are resolved within one business day.",
+        "Is there anything else you would like to know?",
+        "Let me know if you'd like me to walk you through the steps."
+    ]
+
+    def __init__(self, time_to_first_token: float = None, tokens_per_second: float = None):
+        super().__init__()
+        self.model = "local-simulated"
+        self.utility_model = self.model
+        self.time_to_first_token = (
+            time_to_first_token if time_to_first_token is not None else Config.LOCAL_LLM_TIME_TO_FIRST_TOKEN
+        )
+        self.tokens_per_second = tokens_per_second or Config.LOCAL_LLM_TOKENS_PER_SECOND
+
+    def complete(self, messages: List[Dict], model: str = None, **params) -> str:
+        return "".join(self.stream(messages, model, **params))
+
+    def stream(self, messages: List[Dict], model: str = None, **params) -> Iterator[str]:
+        tokens = self._reply_tokens(messages, params.get('max_tokens'))
+        time.sleep(self.time_to_first_token)
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(1.0 / self.tokens_per_second)
+            yield token
+
+    async def acomplete(self, messages: List[Dict], model: str = None, **params) -> str:
+        """Async variant that sleeps on the event loop instead of blocking a thread"""
+        tokens = self._reply_tokens(messages, params.get('max_tokens'))
+        await asyncio.sleep(self.time_to_first_token + max(0, len(tokens) - 1) / self.tokens_per_second)
+        return "".join(tokens)
+
+    def _reply_tokens(self, messages: List[Dict], max_tokens: int = None) -> List[str]:
+        """Build a reply that depends only on the messages, split into word tokens"""
+        system = " ".join(m['content'] for m in messages if m['role'] == 'system')
+        user = next((m['content'] for m in reversed(messages) if m['role'] == 'user'), "")
+
+        if "Reply with 'YES' or 'NO'" in system:
+            reply = "YES"
+        elif "Return only valid JSON" in system:
+            reply = json.dumps({"name": None, "email": None, "phone": None, "company": None, "intent": None})
+        else:
+            seed = int(hashlib.sha256(user.encode('utf-8')).hexdigest(), 16)
+            count = 2 + seed % 3
+            reply = " ".join(self.SENTENCES[(seed >> (8 * i)) % len(self.SENTENCES)] for i in range(count))
+
+        words = reply.split(" ")
+        tokens = [words[0]] + [f" {word}" for word in words[1:]]
+        return tokens[:max_tokens] if max_tokens else tokens
+
+
+BACKENDS = {
+    'groq': GroqBackend,
+    'openai': OpenAIBackend,
+    'local': LocalBackend
+}
+
+def create_backend(provider: str = None) -> LLMBackend:
+    """Instantiate the backend for a provider name"""
+    provider = provider or Config.LLM_PROVIDER
+    if provider not in BACKENDS:
+        raise ValueError(f"Unknown LLM provider: {provider} (expected one of {', '.join(BACKENDS)})")
+    return BACKENDS[provider]()
@@ -0,0 +1,238 @@
+from typing import Dict, Iterator, List, Optional, Union
+from src.llm_backends import LLMBackend, create_backend
+from src.text_segmenter import SentenceSegmenter
+from src.prompt_registry import PromptTemplate, get_prompt_registry
+from src.prompt_builder import get_prompt_builder
+import json
+import threading
+import time
+
+# Output is capped by max_tokens so the rolling summary stays constant-size
+SUMMARY_PROMPT = (
+    "Summarize this conversation in 2-3 sentences, focusing on key topics and user needs. "
+    "If a summary so far is given, update it with the new messages, keeping names, contact "
+    "details and open requests."
+)
+
+class LLMHandler:
+    """Provider-agnostic LLM handler; the backend is chosen by Config.LLM_PROVIDER"""
+
+    FALLBACK_RESPONSE = "I'm sorry, I'm having trouble processing your request right now. Could you please try again?"
+
+    def __init__(self, provider: str = None, backend: LLMBackend = None):
+        self.backend = backend or create_backend(provider)
+        self.provider = self.backend.name
+        self.model = self.backend.model
+        self.max_tokens = 500
+        self.temperature = 0.7
+        self.last_time_to_first_token = None
+        self.prompts = get_prompt_registry()
+        self.prompt_builder = get_prompt_builder()
+        self.last_prompt_usage = {}
+
+    def load_system_prompt(self, prompt_file: str = None) -> str:
+        """Load system prompt from file"""
+        if prompt_file is None:
+            # Served from the shared registry; no per-turn file access
+            return self.get_system_prompt_template().text
+
+        try:
+            with open(prompt_file, 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return self.get_default_prompt()
+
+    def get_system_prompt_template(self) -> PromptTemplate:
+        """Get the system prompt template, falling back to the built-in default"""
+        template = self.prompts.get("assistant_prompt")
+        if template is None:
+            template = self.prompts.get("default_assistant_prompt") or \
+                self.prompts.register("default_assistant_prompt", self.get_default_prompt())
+        return template
+
+    def get_default_prompt(self) -> str:
+        """Default system prompt if file is not found"""
+        return """You are a helpful AI voice assistant. You have access to company documentation and can answer questions about products, services, and general topics.
+
+Key guidelines:
+- Be conversational and natural in your responses
+- Keep responses concise but informative
+- If you don't know something from the documentation, say so
+- If someone seems ready to schedule a call or needs human help, offer to connect them
+- Remember the conversation context
+- Be friendly and professional
+
+When responding:
+- Use natural speech patterns
+- Avoid overly technical jargon unless appropriate
+- Ask clarifying questions when needed
+- Provide actionable information when possible"""
+
+    def _build_messages(self, user_message: str, context: Union[str, List[Dict]] = "", conversation_history: List[Dict] = None,
+                        system_prompt: str = None, summary: str = "") -> List[Dict]:
+        """Build the chat messages for a response within the prompt token budget"""
+        if system_prompt is None:
+            system_prompt = self.load_system_prompt()
+
+        # Sections are kept or truncated by priority; usage is kept for reporting
+        messages, self.last_prompt_usage = self.prompt_builder.build(
+            user_message, system_prompt, context, summary, conversation_history
+        )
+        return messages
+
+    def _response_params(self) -> Dict:
+        """Sampling parameters for assistant replies"""
+        return {
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "top_p": 0.9,
+            "frequency_penalty": 0.1,
+            "presence_penalty": 0.1
+        }
+
+    def generate_response(self, user_message: str, context: Union[str, List[Dict]] = "", conversation_history: List[Dict] = None,
+                          system_prompt: str = None, summary: str = "") -> str:
+        """Generate a response with the configured backend"""
+        try:
+            messages = self._build_messages(user_message, context, conversation_history, system_prompt, summary)
+            return self.backend.complete(messages, self.model, **self._response_params()).strip()
+
+        except Exception as e:
+            print(f"Error generating response: {e}")
+            return self.FALLBACK_RESPONSE
+
+    def generate_response_stream(self, user_message: str, context: Union[str, List[Dict]] = "", conversation_history: List[Dict] = None,
+                                 system_prompt: str = None, summary: str = "",
+                                 cancel_event: threading.Event = None) -> Iterator[Dict]:
+        """Yield 'token' and 'sentence' events as the completion streams in, then a final 'done' event.
+
+        Setting cancel_event stops the request; time to first token is stored in last_time_to_first_token.
+        """
+        segmenter = SentenceSegmenter()
+        parts = []
+        cancelled = False
+        start = time.perf_counter()
+        self.last_time_to_first_token = None
+
+        try:
+            messages = self._build_messages(user_message, context, conversation_history, system_prompt, summary)
+            stream = self.backend.stream(messages, self.model, **self._response_params())
+
+            try:
+                for token in stream:
+                    # Stop reading as soon as the caller cancels
+                    if cancel_event is not None and cancel_event.is_set():
+                        cancelled = True
+                        break
+
+                    if self.last_time_to_first_token is None:
+                        self.last_time_to_first_token = time.perf_counter() - start
+
+                    parts.append(token)
+                    yield {"type": "token", "text": token}
+                    for sentence in segmenter.feed(token):
+                        yield {"type": "sentence", "text": sentence}
+            finally:
+                # Closing the backend stream drops the request
+                stream.close()
+
+            if not cancelled:
+                for sentence in segmenter.flush():
+                    yield {"type": "sentence", "text": sentence}
+
+        except Exception as e:
+            print(f"Error streaming response: {e}")
+            if not parts:
+                fallback = self.FALLBACK_RESPONSE
+                parts.append(fallback)
+                yield {"type": "sentence", "text": fallback}
+
+        yield {
+            "type": "done",
+            "text": "".join(parts).strip(),
+            "cancelled": cancelled,
+            "time_to_first_token": self.last_time_to_first_token
+        }
+
+    def summarize_conversation(self, conversation_history: List[Dict], previous_summary: str = "") -> str:
+        """Summarize conversation history, folding it into a previous summary if given"""
+        return self.update_summary(previous_summary, conversation_history) or "Conversation summary unavailable."
+
+    def update_summary(self, previous_summary: str, new_messages: List[Dict]) -> Optional[str]:
+        """Fold new messages into a rolling summary; None if the call fails"""
+        try:
+            return self.backend.complete(
+                self._summary_messages(previous_summary, new_messages), self.backend.utility_model,
+                max_tokens=150, temperature=0.3
+            ).strip()
+
+        except Exception as e:
+            print(f"Error summarizing conversation: {e}")
+            return None
+
+    def extract_entities(self, text: str) -> Dict:
+        """Extract entities like names, emails, phone numbers from text"""
+        try:
+            content = self.backend.complete(
+                self._entity_messages(text), self.backend.utility_model, max_tokens=200, temperature=0.1
+            )
+            return self._parse_entities(content)
+
+        except Exception as e:
+            print(f"Error extracting entities: {e}")
+            return {}
+
+    def check_response_appropriateness(self, response: str) -> bool:
+        """Check if the response is appropriate and safe"""
+        try:
+            content = self.backend.complete(
+                self._appropriateness_messages(response), self.backend.utility_model, max_tokens=10, temperature=0.1
+            )
+            return content.strip().upper() == "YES"
+
+        except Exception as e:
+            print(f"Error checking response: {e}")
+            return True  # Default to allowing response if check fails
+
+    @staticmethod
+    def _summary_messages(previous_summary: str, new_messages: List[Dict]) -> List[Dict]:
+        conv_text = "\n".join(f"{msg['role'].capitalize()}: {msg['content']}" for msg in new_messages)
+        if previous_summary:
+            conv_text = f"Summary so far: {previous_summary}\n\nNew messages:\n{conv_text}"
+
+        return [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": conv_text}
+        ]
+
+    @staticmethod
+    def _entity_messages(text: str) -> List[Dict]:
+        prompt = f"""Extract the following information from the text if present:
+- Name (person's name)
+- Email (email address)
+- Phone (phone number)
+- Company (company name)
+- Intent (what the person wants to do)
+
+Return as JSON format. If information is not found, use null.
+
+Text: {text}"""
+
+        return [
+            {"role": "system", "content": "You are an entity extraction assistant. Return only valid JSON."},
+            {"role": "user", "content": prompt}
+        ]
+
+    @staticmethod
+    def _parse_entities(content: str) -> Dict:
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            return {}
+
+    @staticmethod
+    def _appropriateness_messages(response: str) -> List[Dict]:
+        return [
+            {"role": "system", "content": "Analyze if this response is appropriate, helpful, and safe for a customer service context. Reply with 'YES' or 'NO' only."},
+            {"role": "user", "content": response}
+        ]
@@ -0,0 +1,135 @@
+import asyncio
+import random
+import weakref
+from typing import Dict, List, Optional, Union
+import httpx
+from config import Config
+from src.llm_backends import LLMBackend, RetryableResponseError
+from src.llm_handler import LLMHandler
+
+# One semaphore per provider for each event loop in the process
+_loop_semaphores = weakref.WeakKeyDictionary()
+
+def _get_semaphore(provider: str, limit: int) -> asyncio.Semaphore:
+    """Get the in-flight request limiter for a provider on the running event loop"""
+    semaphores = _loop_semaphores.setdefault(asyncio.get_running_loop(), {})
+    return semaphores.setdefault(provider, asyncio.Semaphore(limit))
+
+
+class AsyncLLMHandler(LLMHandler):
+    """asyncio LLM handler with concurrency limits, retries and hedging
+
+    Prompts and backends are shared with LLMHandler; the backend's acomplete() is the
+    transport (a pooled httpx client for HTTP providers).
+    """
+
+    def __init__(self, provider: str = None, backend: LLMBackend = None):
+        super().__init__(provider, backend)
+        self.max_concurrency = Config.LLM_MAX_CONCURRENCY
+        self.max_retries = Config.LLM_MAX_RETRIES
+        self.retry_base_delay = Config.LLM_RETRY_BASE_DELAY
+        self.retry_max_delay = Config.LLM_RETRY_MAX_DELAY
+        self.hedge_delay = Config.LLM_HEDGE_DELAY
+        self.stats = {'requests': 0, 'retries': 0, 'hedges': 0, 'hedge_wins': 0, 'failures': 0}
+
+    async def generate_response(self, user_message: str, context: Union[str, List[Dict]] = "",
+                                conversation_history: List[Dict] = None, system_prompt: str = None,
+                                summary: str = "") -> str:
+        """Generate a response without blocking the event loop"""
+        try:
+            messages = self._build_messages(user_message, context, conversation_history, system_prompt, summary)
+            return (await self._chat(messages, self.model, **self._response_params())).strip()
+
+        except Exception as e:
+            print(f"Error generating response: {e}")
+            return self.FALLBACK_RESPONSE
+
+    async def summarize_conversation(self, conversation_history: List[Dict], previous_summary: str = "") -> str:
+        """Summarize conversation history, folding it into a previous summary if given"""
+        return await self.update_summary(previous_summary, conversation_history) or "Conversation summary unavailable."
+
+    async def update_summary(self, previous_summary: str, new_messages: List[Dict]) -> Optional[str]:
+        """Fold new messages into a rolling summary; None if the call fails"""
+        try:
+            return (await self._chat(
+                self._summary_messages(previous_summary, new_messages), self.backend.utility_model,
+                max_tokens=150, temperature=0.3
+            )).strip()
+        except Exception as e:
+            print(f"Error summarizing conversation: {e}")
+            return None
+
+    async def extract_entities(self, text: str) -> Dict:
+        """Extract entities like names, emails, phone numbers from text"""
+        try:
+            content = await self._chat(
+                self._entity_messages(text), self.backend.utility_model, max_tokens=200, temperature=0.1
+            )
+            return self._parse_entities(content)
+        except Exception as e:
+            print(f"Error extracting entities: {e}")
+            return {}
+
+    async def check_response_appropriateness(self, response: str) -> bool:
+        """Check if the response is appropriate and safe"""
+        try:
+            content = await self._chat(
+                self._appropriateness_messages(response), self.backend.utility_model, max_tokens=10, temperature=0.1
+            )
+            return content.strip().upper() == "YES"
+        except Exception as e:
+            print(f"Error checking response: {e}")
+            return True  # Default to allowing response if check fails
+
+    async def _chat(self, messages: List[Dict], model: str, **params) -> str:
+        """Run a chat completion, hedging with a second request if the first is slow"""
+        self.stats['requests'] += 1
+
+        if not self.hedge_delay:
+            return await self._complete_with_retry(messages, model, params)
+
+        primary = asyncio.create_task(self._complete_with_retry(messages, model, params))
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay)
+        if done:
+            return primary.result()
+
+        # Slow tail: race a duplicate request and keep whichever succeeds first
+        self.stats['hedges'] += 1
+        backup = asyncio.create_task(self._complete_with_retry(messages, model, params))
+        pending = {primary, backup}
+        error = None
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.stats['hedge_wins'] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _complete_with_retry(self, messages: List[Dict], model: str, params: Dict) -> str:
+        """Call the backend with jittered exponential backoff on transient failures"""
+        semaphore = _get_semaphore(self.provider, self.max_concurrency)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with semaphore:
+                    return await self.backend.acomplete(messages, model, **params)
+
+            except (httpx.TransportError, RetryableResponseError) as e:
+                if attempt == self.max_retries:
+                    self.stats['failures'] += 1
+                    raise
+
+                # Full jitter keeps retries from many sessions from synchronizing
+                delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt)))
+                if isinstance(e, RetryableResponseError) and e.retry_after is not None:
+                    delay = max(delay, min(e.retry_after, self.retry_max_delay))
+                self.stats['retries'] += 1
+                await asyncio.sleep(delay)
@@ -1,14 +1,23 @@
 import json
+import threading
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, timedelta
 from config import Config
 
 class MemoryManager:
-    def __init__(self):
+    def __init__(self, summarize: Callable[[str, List[Dict]], Optional[str]] = None):
         self.sessions = {}
         self.max_history = Config.MAX_CONVERSATION_HISTORY
         self.session_timeout = Config.SESSION_TIMEOUT
+        
+        # summarize(previous_summary, evicted_messages) -> new summary, or None on failure
+        self.summarize = summarize
+        self._summary_lock = threading.Lock()
+        self._summary_executor = ThreadPoolExecutor(
+            max_workers=Config.SUMMARY_WORKERS, thread_name_prefix="summary"
+        ) if summarize else None
     
     def create_session(self, session_id: str) -> Dict:
         """Create a new conversation session"""
@@ -19,6 +28,9 @@ class MemoryManager:
             'conversation_history': [],
             'user_profile': {},
             'context_summary': "",
+            'summary_version': 0,
+            'unsummarized_messages': [],  # evicted turns not yet folded into the summary
+            'summary_running': False,
             'intent_history': []
         }
         self.sessions[session_id] = session
@@ -63,8 +75,8 @@ class MemoryManager:
             removed_messages = session['conversation_history'][:2]  # Remove oldest pair
             session['conversation_history'] = session['conversation_history'][2:]
             
-            # Update context summary with removed messages
-            self._update_context_summary(session, removed_messages)
+            # Queue removed messages; schedule_summary folds them in off the hot path
+            self._queue_for_summary(session, removed_messages)
         
         self.update_session_activity(session_id)
     
@@ -120,32 +132,111 @@ class MemoryManager:
         
         self.update_session_activity(session_id)
     
+    def has_context(self, session_id: str) -> bool:
+        """Whether the session has history, a summary or profile data a response could depend on"""
+        session = self.sessions.get(session_id)
+        if session is None:
+            return False
+        return bool(
+            session['conversation_history'] or session['context_summary']
+            or session['unsummarized_messages'] or session['user_profile']
+        )
+    
     def get_recent_intents(self, session_id: str, limit: int = 5) -> List[Dict]:
         """Get recent intents for a session"""
         session = self.get_session(session_id)
         return session['intent_history'][-limit:]
     
-    def _update_context_summary(self, session: Dict, removed_messages: List[Dict]):
-        """Update context summary when removing old messages"""
-        # Simple summarization - in production, you might use an LLM for this
+    def _queue_for_summary(self, session: Dict, removed_messages: List[Dict]):
+        """Buffer evicted messages until the summarizer picks them up"""
+        with self._summary_lock:
+            if not self.summarize:
+                # No LLM summarizer: fold them in right away with the simple summary
+                self._apply_fallback_summary(session, removed_messages)
+                return
+            
+            session['unsummarized_messages'].extend(removed_messages)
+            self._cap_backlog(session)
+    
+    def _cap_backlog(self, session: Dict):
+        """Bound the backlog if summarization keeps failing; the overflow is kept in simple form (lock held)"""
+        pending = session['unsummarized_messages']
+        overflow = len(pending) - self.max_history * 2
+        if overflow > 0:
+            self._apply_fallback_summary(session, pending[:overflow])
+            del pending[:overflow]
+    
+    def _apply_fallback_summary(self, session: Dict, messages: List[Dict]):
+        """Append short snippets of the messages to the summary (lock held)"""
+        session['context_summary'] = self._fallback_summary(session['context_summary'], messages)
+        session['summary_version'] += 1
+    
+    @staticmethod
+    def _fallback_summary(previous_summary: str, messages: List[Dict]) -> str:
+        """Summary built without an LLM: truncated snippets of each message"""
         summary_parts = []
         
-        for msg in removed_messages:
+        for msg in messages:
             if msg['role'] == 'user':
                 summary_parts.append(f"User asked about: {msg['content'][:100]}...")
             else:
                 summary_parts.append(f"Assistant responded about: {msg['content'][:100]}...")
         
         new_summary = " | ".join(summary_parts)
-        
-        if session['context_summary']:
-            session['context_summary'] += f" | {new_summary}"
-        else:
-            session['context_summary'] = new_summary
+        summary = f"{previous_summary} | {new_summary}" if previous_summary else new_summary
         
         # Limit summary length
-        if len(session['context_summary']) > 1000:
-            session['context_summary'] = session['context_summary'][-800:]
+        if len(summary) > 1000:
+            summary = summary[-800:]
+        return summary
+    
+    def schedule_summary(self, session_id: str):
+        """Fold evicted messages into the summary in the background (call after responding)"""
+        session = self.sessions.get(session_id)
+        if session is None or not self.summarize:
+            return
+        
+        with self._summary_lock:
+            if session['summary_running'] or not session['unsummarized_messages']:
+                return
+            session['summary_running'] = True
+        self._summary_executor.submit(self._run_summary, session)
+    
+    def _run_summary(self, session: Dict):
+        """Fold pending messages into the summary until none are left"""
+        while True:
+            with self._summary_lock:
+                batch = session['unsummarized_messages']
+                if not batch:
+                    session['summary_running'] = False
+                    return
+                session['unsummarized_messages'] = []
+                previous_summary = session['context_summary']
+                previous_version = session['summary_version']
+            
+            try:
+                summary = self.summarize(previous_summary, batch)
+            except Exception as e:
+                print(f"Error updating conversation summary: {e}")
+                summary = None
+            
+            with self._summary_lock:
+                if summary is None:
+                    # Keep the batch for the next attempt, within the backlog bound
+                    session['unsummarized_messages'][:0] = batch
+                    self._cap_backlog(session)
+                    session['summary_running'] = False
+                    return
+                
+                if session['summary_version'] != previous_version:
+                    # Backlog overflow was folded in meanwhile; keep those newer snippets
+                    current = session['context_summary']
+                    added = current[len(previous_summary):] if current.startswith(previous_summary) else current
+                    summary = f"{summary} | {added.lstrip(' |')}"[-1000:]
+                
+                # Readers only ever see a complete summary and its version
+                session['context_summary'] = summary
+                session['summary_version'] += 1
     
     def get_context_for_llm(self, session_id: str) -> Dict:
         """Get context information formatted for LLM"""
@@ -160,6 +251,7 @@ class MemoryManager:
             'conversation_history': recent_history,
             'user_profile': user_profile,
             'context_summary': session.get('context_summary', ''),
+            'summary_version': session.get('summary_version', 0),
             'recent_intents': recent_intents,
             'session_duration': self._get_session_duration(session)
         }
@@ -0,0 +1,182 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple, Union
+import tiktoken
+from config import Config
+from src.chunker import CHARS_PER_TOKEN
+
+# Approximate per-message framing cost of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+class PromptBuilder:
+    """Assemble chat messages within a token budget, truncating sections by priority"""
+
+    def __init__(self, token_budget: int = None, cache_size: int = None):
+        self.token_budget = token_budget or Config.PROMPT_TOKEN_BUDGET
+        self.cache_size = cache_size or Config.PROMPT_TOKEN_CACHE_SIZE
+        try:
+            self.encoding = tiktoken.get_encoding(Config.TOKENIZER_ENCODING)
+        except Exception as e:
+            # e.g. offline with no cached encoding; budgets fall back to a character estimate
+            print(f"Error loading tokenizer, estimating tokens from characters: {e}")
+            self.encoding = None
+        self._token_counts = OrderedDict()  # text -> token count, least recently used first
+        self._lock = threading.Lock()
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens, reusing counts for chunks and messages seen on earlier turns"""
+        with self._lock:
+            count = self._token_counts.get(text)
+            if count is not None:
+                self._token_counts.move_to_end(text)
+                return count
+
+        if self.encoding is None:
+            count = -(-len(text) // CHARS_PER_TOKEN)
+        else:
+            count = len(self.encoding.encode(text))
+
+        with self._lock:
+            self._token_counts[text] = count
+            if len(self._token_counts) > self.cache_size:
+                self._token_counts.popitem(last=False)
+        return count
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to at most max_tokens tokens"""
+        if self.encoding is None:
+            if len(text) <= max_tokens * CHARS_PER_TOKEN:
+                return text
+            return text[:max(0, max_tokens - 1) * CHARS_PER_TOKEN] + "..."
+
+        tokens = self.encoding.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return self.encoding.decode(tokens[:max(0, max_tokens - 1)]) + "..."
+
+    def build(self, user_message: str, system_prompt: str,
+              context: Union[str, List[Dict], None] = None, summary: str = "",
+              conversation_history: List[Dict] = None) -> Tuple[List[Dict], Dict]:
+        """Build messages and report token usage per section
+
+        Priority: system prompt, user message, top context chunk, the most
+        recent history turns, summary, remaining context chunks, older history.
+        """
+        chunks = self._format_chunks(context)
+        history = [msg for msg in (conversation_history or []) if msg.get('content')]
+        if history and history[-1]['role'] == 'user' and history[-1]['content'] == user_message:
+            # Callers often store the message before building; don't send it twice
+            history = history[:-1]
+        min_history = Config.PROMPT_MIN_HISTORY_MESSAGES
+
+        usage = {'system': 0, 'context': 0, 'summary': 0, 'history': 0, 'user': 0}
+        remaining = self.token_budget
+
+        # Required sections; the system prompt is cut only if it alone exceeds the budget
+        usage['user'] = self.count_tokens(user_message) + MESSAGE_OVERHEAD_TOKENS
+        remaining -= usage['user']
+        system_tokens = self.count_tokens(system_prompt) + MESSAGE_OVERHEAD_TOKENS
+        if system_tokens > remaining:
+            system_prompt = self.truncate(system_prompt, max(0, remaining - MESSAGE_OVERHEAD_TOKENS))
+            system_tokens = self.count_tokens(system_prompt) + MESSAGE_OVERHEAD_TOKENS
+        usage['system'] = system_tokens
+        remaining -= system_tokens
+
+        selected_chunks = []
+        selected_history = []  # newest first
+        summary_text = ""
+        # The context and summary messages each pay their own framing once
+        context_overhead = self.count_tokens("Relevant context from documentation:\n") + MESSAGE_OVERHEAD_TOKENS
+        summary_prefix = "Summary of the earlier conversation:\n"
+
+        def add_chunk(chunk: str) -> bool:
+            nonlocal remaining
+            cost = self.count_tokens(chunk) + 2  # blank-line separator
+            if not selected_chunks:
+                cost += context_overhead
+            if cost <= remaining:
+                selected_chunks.append(chunk)
+                usage['context'] += cost
+                remaining -= cost
+                return True
+
+            # Keep a truncated piece if a meaningful amount still fits
+            available = remaining - (cost - self.count_tokens(chunk))
+            if available >= Config.PROMPT_MIN_PARTIAL_TOKENS:
+                partial = self.truncate(chunk, available)
+                partial_cost = cost - self.count_tokens(chunk) + self.count_tokens(partial)
+                selected_chunks.append(partial)
+                usage['context'] += partial_cost
+                remaining -= partial_cost
+            return False
+
+        def add_history(limit: int) -> bool:
+            nonlocal remaining
+            while len(selected_history) < min(limit, len(history)):
+                msg = history[-1 - len(selected_history)]
+                cost = self.count_tokens(msg['content']) + MESSAGE_OVERHEAD_TOKENS
+                if cost > remaining:
+                    return False
+                selected_history.append(msg)
+                usage['history'] += cost
+                remaining -= cost
+            return True
+
+        if chunks:
+            add_chunk(chunks[0])
+        add_history(min_history)
+
+        if summary:
+            cost = self.count_tokens(summary_prefix + summary) + MESSAGE_OVERHEAD_TOKENS
+            if cost <= remaining:
+                summary_text = summary
+                usage['summary'] = cost
+                remaining -= cost
+
+        # Only continue with the lower-ranked chunks while the previous one fit whole
+        if len(selected_chunks) == 1 and selected_chunks[0] is chunks[0]:
+            for chunk in chunks[1:]:
+                if not add_chunk(chunk):
+                    break
+        if len(selected_history) == min(min_history, len(history)):
+            add_history(len(history))
+
+        messages = [{"role": "system", "content": system_prompt}]
+        if selected_chunks:
+            messages.append({
+                "role": "system",
+                "content": "Relevant context from documentation:\n" + "\n\n".join(selected_chunks)
+            })
+        if summary_text:
+            messages.append({"role": "system", "content": summary_prefix + summary_text})
+        for msg in reversed(selected_history):
+            messages.append({"role": msg["role"], "content": msg["content"]})
+        messages.append({"role": "user", "content": user_message})
+
+        usage['total'] = sum(usage.values())
+        usage['budget'] = self.token_budget
+        usage['context_chunks_used'] = len(selected_chunks)
+        usage['context_chunks_available'] = len(chunks)
+        usage['history_messages_used'] = len(selected_history)
+        usage['history_messages_available'] = len(history)
+        return messages, usage
+
+    def _format_chunks(self, context: Union[str, List[Dict], None]) -> List[str]:
+        """Normalize a context string or ranked search results into chunk strings"""
+        if not context:
+            return []
+        if isinstance(context, str):
+            return [context]
+        return [f"Source: {result['source']}\n{result['content']}" for result in context]
+
+
+_builder: Optional[PromptBuilder] = None
+_builder_lock = threading.Lock()
+
+def get_prompt_builder() -> PromptBuilder:
+    """Get the process-wide prompt builder, sharing its token-count cache"""
+    global _builder
+    with _builder_lock:
+        if _builder is None:
+            _builder = PromptBuilder()
+        return _builder
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+import tiktoken
+from config import Config
+
+class PromptTemplate:
+    """A loaded prompt with its version and precomputed token count"""
+
+    def __init__(self, name: str, text: str, path: str = None, mtime_ns: int = None, size: int = None,
+                 token_count: int = None):
+        self.name = name
+        self.text = text
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.token_count = token_count
+        self.version = hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]
+
+    def format(self, **kwargs) -> str:
+        """Fill {placeholders} in the template"""
+        return self.text.format(**kwargs)
+
+
+class PromptRegistry:
+    """Load prompt templates once and revalidate them by mtime so edits apply without a restart"""
+
+    def __init__(self, prompts_dir: str = None, check_interval: float = None):
+        self.prompts_dir = prompts_dir or Config.PROMPTS_DIR
+        self.check_interval = check_interval if check_interval is not None else Config.PROMPT_CHECK_INTERVAL
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._last_checked: Dict[str, float] = {}
+        self._missing = set()  # names whose file was absent at the last check
+        self._lock = threading.Lock()
+        self._encoding = None
+
+    def get(self, name: str) -> Optional[PromptTemplate]:
+        """Get a template by name (file name without .txt), reloading it if the file changed"""
+        now = time.monotonic()
+        with self._lock:
+            template = self._templates.get(name)
+            if template is not None and template.path is None:
+                return template
+            # Loaded templates and missing files are both rechecked at most once per interval
+            known = template is not None or name in self._missing
+            if known and now - self._last_checked.get(name, 0) < self.check_interval:
+                return template
+            self._last_checked[name] = now
+
+        path = os.path.join(self.prompts_dir, f"{name}.txt")
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._missing.add(name)
+                if template is not None:
+                    self._templates.pop(name, None)
+            return None
+
+        if template is not None and template.mtime_ns == stat.st_mtime_ns and template.size == stat.st_size:
+            return template
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read().strip()
+        except OSError as e:
+            print(f"Error loading prompt {name}: {e}")
+            return template
+
+        template = PromptTemplate(name, text, path, stat.st_mtime_ns, stat.st_size, self.count_tokens(text))
+        with self._lock:
+            self._templates[name] = template
+            self._missing.discard(name)
+        return template
+
+    def get_text(self, name: str, default: str = None) -> Optional[str]:
+        """Get a template's text, or default if it does not exist"""
+        template = self.get(name)
+        return template.text if template is not None else default
+
+    def register(self, name: str, text: str) -> PromptTemplate:
+        """Register an in-memory template, e.g. a built-in default"""
+        template = PromptTemplate(name, text, token_count=self.count_tokens(text))
+        with self._lock:
+            self._templates[name] = template
+        return template
+
+    def list_templates(self) -> List[str]:
+        """Names of all templates on disk and in memory"""
+        names = set(self._templates)
+        if os.path.isdir(self.prompts_dir):
+            names.update(f[:-4] for f in os.listdir(self.prompts_dir) if f.endswith('.txt'))
+        return sorted(names)
+
+    def count_tokens(self, text: str) -> Optional[int]:
+        """Count tokens with the configured tiktoken encoding"""
+        try:
+            if self._encoding is None:
+                self._encoding = tiktoken.get_encoding(Config.TOKENIZER_ENCODING)
+            return len(self._encoding.encode(text))
+        except Exception as e:
+            print(f"Error counting prompt tokens: {e}")
+            return None
+
+
+_registry: Optional[PromptRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_prompt_registry() -> PromptRegistry:
+    """Get the process-wide prompt registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = PromptRegistry()
+        return _registry
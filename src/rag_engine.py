@@ -1,24 +1,81 @@
 import os
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import PyPDF2
 from sentence_transformers import SentenceTransformer
 import faiss
 import numpy as np
 import pickle
-from typing import List, Dict, Tuple
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Tuple
 import re
 from urllib.parse import urljoin, urlparse
 from config import Config
+from src.embedding_cache import EmbeddingCache
+from src import kb_storage, vector_index
+from src.document_store import DocumentStore, content_hash
+from src.chunker import TokenChunker
+from src.ingestion import IngestionPipeline
+
+class SearchResult(Mapping):
+    """Read-only view of a document plus its similarity score, without copying the document"""
+    
+    __slots__ = ('document', 'similarity_score')
+    
+    def __init__(self, document: Dict, similarity_score: float):
+        self.document = document
+        self.similarity_score = similarity_score
+    
+    def __getitem__(self, key):
+        if key == 'similarity_score':
+            return self.similarity_score
+        return self.document[key]
+    
+    def __iter__(self):
+        yield from self.document
+        yield 'similarity_score'
+    
+    def __len__(self):
+        return len(self.document) + 1
+    
+    def __repr__(self):
+        return f"SearchResult({self.document['source']!r}, chunk {self.document['chunk_id']}, score={self.similarity_score:.3f})"
+
 
 class RAGEngine:
     def __init__(self):
         self.embedding_model = SentenceTransformer(Config.EMBEDDING_MODEL)
-        self.documents = []
-        self.embeddings = None
+        self.documents = DocumentStore()
+        self.embeddings = None  # float32 copy of the indexed vectors; None in lean mode
         self.index = None
-        self.chunk_size = Config.CHUNK_SIZE_RAG
-        self.chunk_overlap = Config.CHUNK_OVERLAP
+        self.index_type = Config.INDEX_TYPE  # 'auto' resolves per build from the corpus size
+        self.vector_storage = Config.INDEX_VECTOR_STORAGE  # 'float32', 'float16' or 'pq'
+        self.lean = Config.KB_LEAN_MODE  # keep vectors only inside the index
+        self.nprobe = Config.INDEX_NPROBE
+        self.ef_search = Config.INDEX_EF_SEARCH
+        # Chunks are sized in embedding-model tokens; longer ones would be truncated by the model
+        self.chunker = TokenChunker(
+            self._count_tokens,
+            min(Config.CHUNK_MAX_TOKENS, self.embedding_model.max_seq_length - 2),  # room for [CLS] and [SEP]
+            Config.CHUNK_OVERLAP_TOKENS
+        )
+        self.kb_version = 0  # bumped whenever the searchable contents change
+        
+        # Chunk ids are positions in self.documents and in the index
+        self.deleted_ids = set()  # tombstoned chunks, dropped at the next compaction
+        self._indexed_count = 0  # documents[:_indexed_count] are in the index
+        self._embedded = []  # embedding batches for the chunks after them, computed by embed_new_chunks
+        self._source_chunks = {}  # source -> {content hash: id} of its live chunks
+        self._index_read_only = False  # memory-mapped indexes must be rebuilt before adding
+        self.query_cache = EmbeddingCache()
+        
+        # Pooled HTTP connections for scraping
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        adapter = HTTPAdapter(pool_connections=Config.INGEST_FETCH_WORKERS, pool_maxsize=Config.INGEST_FETCH_WORKERS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
         # Ensure directories exist
         os.makedirs(Config.EMBEDDINGS_DIR, exist_ok=True)
@@ -27,10 +84,7 @@ class RAGEngine:
     def scrape_website(self, url: str) -> str:
         """Scrape website content"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.session.get(url, timeout=(Config.SCRAPE_CONNECT_TIMEOUT, Config.SCRAPE_READ_TIMEOUT))
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -56,73 +110,47 @@ class RAGEngine:
     def extract_pdf_text(self, pdf_path: str) -> str:
         """Extract text from PDF file"""
         try:
-            text = ""
             with open(pdf_path, 'rb') as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            return text
+                return "".join(f"{page.extract_text() or ''}\n" for page in pdf_reader.pages)
         except Exception as e:
             print(f"Error extracting PDF text: {e}")
             return ""
     
     def chunk_text(self, text: str) -> List[str]:
-        """Split text into chunks with overlap"""
-        if len(text) <= self.chunk_size:
-            return [text]
-        
-        chunks = []
-        start = 0
-        
-        while start < len(text):
-            end = start + self.chunk_size
-            
-            # If this isn't the last chunk, try to end at a sentence boundary
-            if end < len(text):
-                # Look for sentence endings within the last 100 characters
-                last_period = text.rfind('.', end - 100, end)
-                last_exclamation = text.rfind('!', end - 100, end)
-                last_question = text.rfind('?', end - 100, end)
-                
-                best_end = max(last_period, last_exclamation, last_question)
-                if best_end > start:
-                    end = best_end + 1
-            
-            chunk = text[start:end].strip()
-            if chunk:
-                chunks.append(chunk)
-            
-            # Move start position with overlap
-            start = end - self.chunk_overlap
-            if start >= len(text):
-                break
-        
-        return chunks
+        """Split text into overlapping chunks of at most chunker.max_tokens tokens"""
+        return list(self.chunker.chunks([text]))
+    
+    def _count_tokens(self, texts: List[str]) -> List[int]:
+        """Embedding-model tokens in each text, excluding special tokens"""
+        encoded = self.embedding_model.tokenizer(texts, add_special_tokens=False, verbose=False)
+        return [len(ids) for ids in encoded['input_ids']]
     
     def process_document(self, content: str, source: str) -> List[Dict]:
         """Process document content into chunks with metadata"""
-        chunks = self.chunk_text(content)
-        documents = []
-        
-        for i, chunk in enumerate(chunks):
-            doc = {
-                'content': chunk,
-                'source': source,
-                'chunk_id': i,
-                'word_count': len(chunk.split())
-            }
-            documents.append(doc)
-        
-        return documents
+        return list(self.iter_document_chunks([content], source))
+    
+    def iter_document_chunks(self, pieces: Iterable[str], source: str) -> Iterator[Dict]:
+        """Chunk a document arriving in pieces (e.g. PDF pages), yielding chunks as they complete"""
+        for chunk_id, chunk in enumerate(self.chunker.chunks(pieces)):
+            yield self._make_document(chunk, source, chunk_id)
+    
+    @staticmethod
+    def _make_document(chunk: str, source: str, chunk_id: int) -> Dict:
+        return {
+            'content': chunk,
+            'source': source,
+            'chunk_id': chunk_id,
+            'word_count': len(chunk.split()),
+            'content_hash': content_hash(chunk)
+        }
     
     def add_url(self, url: str):
         """Add website content to the knowledge base"""
         print(f"Processing URL: {url}")
         content = self.scrape_website(url)
         if content:
-            documents = self.process_document(content, url)
-            self.documents.extend(documents)
-            print(f"Added {len(documents)} chunks from {url}")
+            self.add_source(url, self.process_document(content, url))
         else:
             print(f"No content extracted from {url}")
     
@@ -131,58 +159,329 @@ class RAGEngine:
         print(f"Processing PDF: {pdf_path}")
         content = self.extract_pdf_text(pdf_path)
         if content:
-            documents = self.process_document(content, pdf_path)
-            self.documents.extend(documents)
-            print(f"Added {len(documents)} chunks from {pdf_path}")
+            self.add_source(pdf_path, self.process_document(content, pdf_path))
         else:
             print(f"No content extracted from {pdf_path}")
     
+    def ingest(self, urls: List[str] = None, pdf_paths: List[str] = None) -> Dict:
+        """Add many sources at once: URLs are fetched concurrently, PDF pages extracted in
+        worker processes, and chunks embedded in batches while later sources are still loading
+        
+        Returns throughput statistics; see src/ingestion.py.
+        """
+        return IngestionPipeline(self).run(urls or [], pdf_paths or [])
+    
+    def add_source(self, source: str, documents: List[Dict]):
+        """Add or replace a source's chunks; call update_index() to make them searchable
+        
+        Chunks the source already has (same content) are not added again, so re-adding a
+        source keeps its unchanged chunks and tombstones the ones that went away.
+        """
+        stale = self.remove_stale_chunks(source, {content_hash(doc['content']) for doc in documents})
+        added = self.append_chunks(documents)
+        print(f"Added {added} chunks from {source} ({len(documents) - added} already indexed, {stale} removed)")
+    
+    def append_chunks(self, documents: Iterable[Dict]) -> int:
+        """Append chunks whose content isn't already in their source; returns the number added
+        
+        Identical chunks from different sources are each kept, so removing one source never
+        takes content away from another.
+        """
+        added = 0
+        for doc in documents:
+            digest = doc.get('content_hash') or content_hash(doc['content'])
+            source_chunks = self._source_chunks.setdefault(doc['source'], {})
+            if digest in source_chunks:
+                continue
+            doc['content_hash'] = digest
+            source_chunks[digest] = len(self.documents)
+            self.documents.append(doc)
+            added += 1
+        return added
+    
+    def remove_stale_chunks(self, source: str, current_hashes: set) -> int:
+        """Tombstone a source's chunks whose content is no longer in current_hashes"""
+        stale = [digest for digest in self._source_chunks.get(source, ()) if digest not in current_hashes]
+        if stale:
+            self._tombstone(source, stale)
+            self.kb_version += 1
+        return len(stale)
+    
+    def remove_source(self, source: str) -> int:
+        """Tombstone every chunk of a source; returns the number of chunks removed"""
+        removed = list(self._source_chunks.get(source, ()))
+        self._tombstone(source, removed)
+        if removed:
+            self.kb_version += 1
+            if self._needs_compaction():
+                self.compact()
+        return len(removed)
+    
     def build_index(self):
-        """Build FAISS index from documents"""
+        """Build FAISS index from documents, re-embedding every live chunk
+        
+        When nothing is indexed yet, embeddings already computed by embed_new_chunks are reused.
+        """
+        live = [i for i in range(len(self.documents)) if i not in self.deleted_ids]
+        embeddings = None
+        if self.index is None and self._indexed_count == 0 and self._embedded:
+            embeddings = self._encode_new_chunks()[live]
+        self._embedded = []
+        
+        if self.deleted_ids:
+            self.documents = self.documents.take(live)
+            self.deleted_ids = set()
+        self._reset_source_chunks()
+        
         if not self.documents:
             print("No documents to index")
             return
         
-        print("Building embeddings...")
-        texts = [doc['content'] for doc in self.documents]
-        embeddings = self.embedding_model.encode(texts, show_progress_bar=True)
+        if embeddings is None:
+            print("Building embeddings...")
+            embeddings = self._encode_texts(self.documents.column('content'))
+        
+        # Build FAISS index (inner product for cosine similarity)
+        self.index = self._build_vector_index(embeddings)
+        
+        self.embeddings = None if self.lean else embeddings
+        self._indexed_count = len(self.documents)
+        self._index_read_only = False
+        self.kb_version += 1
+        print(f"Built {vector_index.index_type_of(self.index)} index with {len(self.documents)} documents")
+    
+    def update_index(self):
+        """Embed only chunks added since the last update and append them to the live index"""
+        if self.index is None:
+            self.build_index()
+            return
+        
+        new_ids = range(self._indexed_count, len(self.documents))
+        if new_ids:
+            embeddings = self._encode_new_chunks()
+            if self._index_read_only:
+                # Copy the mapped index into memory, keeping its type, storage and training
+                index = vector_index.empty_like(self.index)
+                index.add(np.ascontiguousarray(self._stored_vectors(), dtype=np.float32))
+                vector_index.set_search_params(index, self.nprobe, self.ef_search)
+                self.index = index
+                self._index_read_only = False
+            self.index.add(embeddings)
+            if self.embeddings is not None:
+                self.embeddings = np.vstack([self.embeddings, embeddings])
+            self._indexed_count = len(self.documents)
+            self.kb_version += 1
+            print(f"Indexed {len(new_ids)} new chunks ({self.document_count} total)")
+        
+        if self._needs_compaction():
+            self.compact()
+    
+    def compact(self):
+        """Drop tombstoned chunks and rebuild the index from the stored vectors (no re-embedding)"""
+        if not self.deleted_ids or self.index is None:
+            return
+        
+        keep = [i for i in range(self._indexed_count) if i not in self.deleted_ids]
+        pending = [i for i in range(self._indexed_count, len(self.documents)) if i not in self.deleted_ids]
+        vectors = self._stored_vectors()[keep]
+        index = self._rebuild_index(vectors) if keep else None
+        if self._embedded:
+            # Keep embeddings computed ahead for the pending chunks that survive
+            embedded = np.vstack(self._embedded)
+            end = self._indexed_count + len(embedded)
+            self._embedded = [embedded[[i - self._indexed_count for i in pending if i < end]]]
+        
+        self.documents = self.documents.take(keep + pending)
+        self.embeddings = None if self.lean else vectors
+        self.deleted_ids = set()
+        self._indexed_count = len(keep)
+        self._reset_source_chunks()
+        
+        self.index = index
+        self._index_read_only = False
+        self.kb_version += 1
+        print(f"Compacted knowledge base to {len(self.documents)} chunks")
+    
+    def embed_new_chunks(self) -> int:
+        """Embed chunks added since the last call without adding them to the index
+        
+        Lets bulk loads embed batches as chunks arrive but build (and train) the index once,
+        over the whole corpus; update_index() or build_index() then uses these embeddings.
+        """
+        start = self._indexed_count + sum(len(batch) for batch in self._embedded)
+        new_ids = range(start, len(self.documents))
+        if new_ids:
+            self._embedded.append(self._encode_texts([self.documents.content(i) for i in new_ids]))
+        return len(new_ids)
+    
+    def optimize_index(self):
+        """Rebuild the index from the stored vectors if, with INDEX_TYPE 'auto', the corpus
+        has grown past the size its current index type was chosen for (no re-embedding)"""
+        if self.index is None or self.index_type != 'auto':
+            return
+        
+        index_type = vector_index.choose_index_type(self._indexed_count)
+        if index_type == vector_index.index_type_of(self.index):
+            return
+        if not self._can_retrain():
+            print(f"Keeping {vector_index.index_type_of(self.index)} index: lean mode has only quantized "
+                  f"vectors to train a {index_type} index on; rebuild with build_index()")
+            return
+        
+        self.index = self._build_vector_index(self._stored_vectors())
+        self._index_read_only = False
+        self.kb_version += 1
+        print(f"Rebuilt index as {index_type} for {self._indexed_count} chunks")
+    
+    @property
+    def document_count(self) -> int:
+        """Number of live (not tombstoned) chunks"""
+        return len(self.documents) - len(self.deleted_ids)
+    
+    def _encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed chunk contents; normalized by the model so inner product equals cosine similarity"""
+        return self.embedding_model.encode(
+            texts, show_progress_bar=len(texts) > 100, normalize_embeddings=True, convert_to_numpy=True
+        ).astype('float32', copy=False)
+    
+    def _encode_new_chunks(self) -> np.ndarray:
+        """Embeddings of every chunk after documents[:_indexed_count], encoding only those not embedded yet"""
+        self.embed_new_chunks()
+        embeddings = np.vstack(self._embedded)
+        self._embedded = []
+        return embeddings
+    
+    def _build_vector_index(self, embeddings: np.ndarray):
+        return vector_index.build_index(embeddings, self.index_type, self.nprobe, self.ef_search, self.vector_storage)
+    
+    def _can_retrain(self) -> bool:
+        """Whether a new index can be trained on the stored vectors without compounding quantization error"""
+        return self.embeddings is not None or vector_index.storage_of(self.index) == 'float32'
+    
+    def _rebuild_index(self, vectors: np.ndarray):
+        """Index over stored vectors; with only quantized vectors, the current index's training is reused"""
+        if self._can_retrain():
+            # Rebuilding also re-applies the automatic index choice for the new corpus size
+            return self._build_vector_index(vectors)
+        index = vector_index.empty_like(self.index)
+        index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+        vector_index.set_search_params(index, self.nprobe, self.ef_search)
+        return index
+    
+    def _stored_vectors(self) -> np.ndarray:
+        """Indexed vectors, reconstructed from the index when no separate copy is kept"""
+        if self.embeddings is not None:
+            return self.embeddings
+        return vector_index.reconstruct_all(self.index)
+    
+    def _tombstone(self, source: str, digests: List[str]):
+        source_chunks = self._source_chunks.get(source, {})
+        for digest in digests:
+            self.deleted_ids.add(source_chunks.pop(digest))
+        if not source_chunks:
+            self._source_chunks.pop(source, None)
+    
+    def _needs_compaction(self) -> bool:
+        return len(self.deleted_ids) > Config.KB_COMPACTION_RATIO * max(1, len(self.documents))
+    
+    def _reset_source_chunks(self):
+        """Rebuild the source -> chunk map with one pass over the documents"""
+        self._source_chunks = {}
+        sources = self.documents.column('source')
+        for i, digest in enumerate(self.documents.column('content_hash')):
+            if i in self.deleted_ids:
+                continue
+            source_chunks = self._source_chunks.setdefault(sources[i], {})
+            if digest in source_chunks:
+                # Repeated chunks within a source, saved before deduplication existed
+                self.deleted_ids.add(i)
+            else:
+                source_chunks[digest] = i
+    
+    def set_search_params(self, nprobe: int = None, ef_search: int = None):
+        """Trade accuracy for speed on IVF (nprobe) and HNSW (ef_search) indexes"""
+        self.nprobe = nprobe or self.nprobe
+        self.ef_search = ef_search or self.ef_search
+        if self.index is not None:
+            vector_index.set_search_params(self.index, self.nprobe, self.ef_search)
+    
+    def index_report(self, queries: List[str] = None, index_types: List[str] = None, top_k: int = None) -> List[Dict]:
+        """Recall and latency of each index type against the exact flat index on this corpus"""
+        if self.index is None:
+            print("Index not built. Call build_index() first.")
+            return []
+        
+        query_embeddings = self.encode_queries(queries) if queries else None
+        return vector_index.recall_latency_report(
+            self._stored_vectors(), query_embeddings, index_types, top_k,
+            nprobe=self.nprobe, ef_search=self.ef_search
+        )
+    
+    def encode_queries(self, queries: List[str]) -> np.ndarray:
+        """Encode queries into L2-normalized float32 embeddings, reusing recent ones"""
+        # Switching embedding_model invalidates everything cached for the old one
+        self.query_cache.bind(self.embedding_model)
         
-        # Normalize embeddings for cosine similarity
-        embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        keys = [self.normalize_query(query) for query in queries]
+        cached = self.query_cache.get_many(keys)
         
-        # Build FAISS index
-        dimension = embeddings.shape[1]
-        self.index = faiss.IndexFlatIP(dimension)  # Inner product for cosine similarity
-        self.index.add(embeddings.astype('float32'))
+        # Encode each distinct miss once
+        missing = list(dict.fromkeys(key for key, vector in zip(keys, cached) if vector is None))
+        if missing:
+            embeddings = self.embedding_model.encode(missing, normalize_embeddings=True, convert_to_numpy=True)
+            self.query_cache.put_many(missing, embeddings)
+            encoded = dict(zip(missing, embeddings.astype('float32', copy=False)))
+            cached = [encoded[key] if vector is None else vector for key, vector in zip(keys, cached)]
         
-        self.embeddings = embeddings
-        print(f"Built index with {len(self.documents)} documents")
+        return np.stack(cached).astype('float32', copy=False)
+    
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Cache key for a query: case and whitespace don't change the (uncased) model's embedding"""
+        return " ".join(query.lower().split())
     
-    def search(self, query: str, top_k: int = None) -> List[Dict]:
+    def search(self, query: str, top_k: int = None) -> List[SearchResult]:
         """Search for relevant documents"""
+        results = self.search_batch([query], top_k)
+        return results[0] if results else []
+    
+    def search_batch(self, queries: List[str], top_k: int = None) -> List[List[SearchResult]]:
+        """Search for several queries with one encoding pass and one index search"""
         if top_k is None:
             top_k = Config.TOP_K_RESULTS
-            
+        
         if not self.index:
             print("Index not built. Call build_index() first.")
-            return []
+            return [[] for _ in queries]
         
-        # Encode query
-        query_embedding = self.embedding_model.encode([query])
-        query_embedding = query_embedding / np.linalg.norm(query_embedding, axis=1, keepdims=True)
+        top_k = min(top_k, self.index.ntotal)
+        if not queries or top_k <= 0:
+            return [[] for _ in queries]
         
-        # Search
-        scores, indices = self.index.search(query_embedding.astype('float32'), top_k)
+        # Encode all queries in one forward pass, then search the whole query matrix;
+        # over-fetch so tombstoned hits can be dropped without coming up short
+        query_embeddings = self.encode_queries(queries)
+        deleted = self.deleted_ids
+        fetch = min(top_k + len(deleted), self.index.ntotal)
+        scores, indices = self.index.search(query_embeddings, fetch)
         
+        documents = self.documents
+        num_documents = len(documents)
         results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx < len(self.documents):
-                result = self.documents[idx].copy()
-                result['similarity_score'] = float(score)
-                results.append(result)
+        for row_scores, row_indices in zip(scores.tolist(), indices.tolist()):
+            # FAISS pads missing neighbours with -1
+            results.append([
+                SearchResult(documents[idx], score)
+                for score, idx in zip(row_scores, row_indices)
+                if 0 <= idx < num_documents and idx not in deleted
+            ][:top_k])
         
         return results
     
+    def get_context_chunks(self, query: str, top_k: int = None) -> List[SearchResult]:
+        """Get ranked chunks for a query, leaving the size budget to the prompt builder"""
+        return self.search(query, top_k)
+    
     def get_context(self, query: str, max_length: int = None) -> str:
         """Get relevant context for a query"""
         if max_length is None:
@@ -211,53 +510,89 @@ class RAGEngine:
         return "\n\n".join(context_parts)
     
     def save_index(self, path: str):
-        """Save the FAISS index and documents"""
+        """Save the FAISS index, embeddings and documents (see src/kb_storage.py for the format)"""
         if self.index is None:
             print("No index to save")
             return
         
-        # Save FAISS index
-        faiss.write_index(self.index, f"{path}.faiss")
-        
-        # Save documents and embeddings
-        with open(f"{path}.pkl", 'wb') as f:
-            pickle.dump({
-                'documents': self.documents,
-                'embeddings': self.embeddings
-            }, f)
-        
+        kb_storage.save(
+            path, self.index, self.documents[:self._indexed_count], self.embeddings,
+            [i for i in self.deleted_ids if i < self._indexed_count]
+        )
         print(f"Index saved to {path}")
     
     def load_index(self, path: str):
-        """Load the FAISS index and documents"""
+        """Load the FAISS index and documents, memory-mapping the saved files"""
         try:
-            # Load FAISS index
-            self.index = faiss.read_index(f"{path}.faiss")
-            
-            # Load documents and embeddings
-            with open(f"{path}.pkl", 'rb') as f:
-                data = pickle.load(f)
-                self.documents = data['documents']
-                self.embeddings = data['embeddings']
+            if kb_storage.exists(path):
+                self.index, self.documents, self.embeddings, meta, self._index_read_only = kb_storage.load(
+                    path, load_embeddings=not self.lean
+                )
+                self.deleted_ids = set(meta['deleted_ids'])
+            else:
+                self._load_legacy_index(path)
+                self._index_read_only = False
             
+            vector_index.set_search_params(self.index, self.nprobe, self.ef_search)
+            self._indexed_count = len(self.documents)
+            self._embedded = []
+            self._reset_source_chunks()
+            self.kb_version += 1
             print(f"Index loaded from {path}")
             return True
         except Exception as e:
             print(f"Error loading index: {e}")
             return False
     
+    def _load_legacy_index(self, path: str):
+        """Read a knowledge base saved as .faiss + .pkl by earlier versions"""
+        print(f"Loading legacy pickle knowledge base from {path}.pkl; save it again to convert")
+        self.index = faiss.read_index(f"{path}.faiss")
+        with open(f"{path}.pkl", 'rb') as f:
+            data = pickle.load(f)
+        self.documents = DocumentStore(data['documents'])
+        self.embeddings = None if self.lean else np.asarray(data['embeddings'], dtype=np.float32)
+        self.deleted_ids = set(data.get('deleted_ids', []))
+    
+    def _memory_per_chunk(self) -> Dict:
+        """Approximate bytes per chunk: private memory, plus pages mapped from shared files"""
+        count = max(1, len(self.documents))
+        documents = self.documents.memory_usage()
+        vectors = vector_index.vector_bytes(self.index) * self.index.ntotal if self.index is not None else 0
+        embeddings = self.embeddings.nbytes if self.embeddings is not None else 0
+        mapped_embeddings = isinstance(self.embeddings, np.memmap)
+        
+        resident = documents['resident'] + vectors + (0 if mapped_embeddings else embeddings)
+        mapped = documents['mapped'] + (embeddings if mapped_embeddings else 0)
+        return {
+            'bytes_per_chunk': resident / count,
+            'mapped_bytes_per_chunk': mapped / count,
+            'vector_bytes_per_chunk': vectors / count,
+            'document_bytes_per_chunk': documents['resident'] / count
+        }
+    
     def get_statistics(self) -> Dict:
         """Get statistics about the knowledge base"""
-        if not self.documents:
+        live_ids = [i for i in range(len(self.documents)) if i not in self.deleted_ids]
+        if not live_ids:
             return {}
         
-        total_words = sum(doc['word_count'] for doc in self.documents)
-        sources = list(set(doc['source'] for doc in self.documents))
+        word_counts = self.documents.column('word_count')
+        doc_sources = self.documents.column('source')
+        total_words = sum(word_counts[i] for i in live_ids)
+        sources = list(set(doc_sources[i] for i in live_ids))
         
         return {
-            'total_documents': len(self.documents),
+            'total_documents': len(live_ids),
+            'deleted_chunks': len(self.deleted_ids),
+            'unindexed_chunks': len(self.documents) - self._indexed_count,
             'total_words': total_words,
             'unique_sources': len(sources),
             'sources': sources,
-            'embedding_dimension': self.embeddings.shape[1] if self.embeddings is not None else 0
+            'embedding_dimension': self.index.d if self.index is not None else 0,
+            'index_type': vector_index.index_type_of(self.index) if self.index is not None else None,
+            'vector_storage': vector_index.storage_of(self.index) if self.index is not None else None,
+            'lean_mode': self.embeddings is None,
+            **self._memory_per_chunk(),
+            'query_cache': self.query_cache.get_statistics()
         }
\ No newline at end of file
@@ -0,0 +1,114 @@
+import re
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional
+import numpy as np
+from config import Config
+
+class SemanticResponseCache:
+    """Nearest-neighbour cache of past answers keyed by question embedding"""
+
+    def __init__(self, encode: Callable[[List[str]], np.ndarray], threshold: float = None,
+                 ttl: float = None, max_entries: int = None):
+        self.encode = encode  # must return L2-normalized float32 rows
+        self.threshold = threshold if threshold is not None else Config.SEMANTIC_CACHE_THRESHOLD
+        self.ttl = ttl if ttl is not None else Config.SEMANTIC_CACHE_TTL
+        self.max_entries = max_entries or Config.SEMANTIC_CACHE_MAX_ENTRIES
+
+        self._lock = threading.Lock()
+        self._vectors = None  # (max_entries, dim), allocated on first store
+        self._answers: List[Optional[str]] = [None] * self.max_entries
+        self._namespace_ids = np.full(self.max_entries, -1, dtype=np.int64)  # -1 marks a free slot
+        self._created = np.zeros(self.max_entries, dtype=np.float64)
+        self._last_used = np.zeros(self.max_entries, dtype=np.float64)
+        self._namespaces: Dict[Hashable, int] = {}
+        self._stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+
+    @staticmethod
+    def normalize_question(text: str) -> str:
+        """Lowercase and strip punctuation and extra whitespace"""
+        return " ".join(re.sub(r"[^\w\s]", " ", text.lower()).split())
+
+    def lookup(self, question: str, namespace: Hashable) -> Optional[str]:
+        """Return a cached answer for a similar question in the same namespace, if any"""
+        normalized = self.normalize_question(question)
+        if not normalized:
+            return None
+
+        with self._lock:
+            namespace_id = self._namespaces.get(namespace)
+            empty = self._vectors is None or namespace_id is None
+        if empty:
+            self._count('misses')
+            return None
+
+        query = self.encode([normalized])[0]
+        now = time.time()
+
+        with self._lock:
+            scores = self._vectors @ query
+            live = (self._namespace_ids == namespace_id) & (now - self._created <= self.ttl)
+            scores[~live] = -np.inf
+
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self._stats['misses'] += 1
+                return None
+
+            self._last_used[best] = now
+            self._stats['hits'] += 1
+            return self._answers[best]
+
+    def store(self, question: str, answer: str, namespace: Hashable):
+        """Cache an answer, evicting expired or least recently used entries when full"""
+        normalized = self.normalize_question(question)
+        if not normalized or not answer:
+            return
+
+        vector = self.encode([normalized])[0]
+        now = time.time()
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+            namespace_id = self._namespaces.setdefault(namespace, len(self._namespaces))
+
+            slot = self._find_slot(now)
+            self._vectors[slot] = vector
+            self._answers[slot] = answer
+            self._namespace_ids[slot] = namespace_id
+            self._created[slot] = now
+            self._last_used[slot] = now
+            self._stats['stores'] += 1
+
+    def clear(self):
+        """Drop every cached answer"""
+        with self._lock:
+            self._namespace_ids[:] = -1
+            self._answers = [None] * self.max_entries
+            self._namespaces.clear()
+
+    def get_statistics(self) -> Dict:
+        """Get hit-rate metrics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = int((self._namespace_ids >= 0).sum())
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def _find_slot(self, now: float) -> int:
+        """Pick a free slot, else an expired one, else the least recently used (lock held)"""
+        free = np.flatnonzero(self._namespace_ids < 0)
+        if len(free):
+            return int(free[0])
+
+        self._stats['evictions'] += 1
+        expired = np.flatnonzero(now - self._created > self.ttl)
+        if len(expired):
+            return int(expired[0])
+        return int(np.argmin(self._last_used))
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
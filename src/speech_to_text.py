@@ -1,17 +1,35 @@
-import whisper
 import speech_recognition as sr
-import io
-import tempfile
-import os
-from pydub import AudioSegment
+import queue
+import threading
+from collections import deque
 import numpy as np
+from src.audio_decoder import AudioDecoder, Resampler, WHISPER_SAMPLE_RATE
+from src.transcription_service import get_transcription_service
+from src.stt_worker_pool import get_stt_worker_pool
+from src.vad import VoiceActivityDetector
+from src.whisper_profiles import load_whisper_model, get_transcribe_options
 from config import Config
 
 class SpeechToText:
     def __init__(self):
-        self.whisper_model = whisper.load_model("base")
+        self.worker_pool = None
+        self.batch_service = None
+        
+        if Config.STT_WORKERS > 0:
+            # Models live in the worker processes only
+            self.worker_pool = get_stt_worker_pool()
+            self.whisper_model = None
+        elif Config.STT_BATCHING:
+            # Share one model and one batching queue across all sessions
+            self.batch_service = get_transcription_service()
+            self.whisper_model = self.batch_service.model
+        else:
+            self.whisper_model = load_whisper_model()
+            self.transcribe_options = get_transcribe_options(self.whisper_model)
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
+        self.decoder = AudioDecoder()
+        self.vad = VoiceActivityDetector()
         
         # Adjust for ambient noise
         with self.microphone as source:
@@ -20,8 +38,9 @@ class SpeechToText:
     def transcribe_audio_file(self, audio_file_path):
         """Transcribe audio file using Whisper"""
         try:
-            result = self.whisper_model.transcribe(audio_file_path)
-            return result["text"].strip()
+            with open(audio_file_path, 'rb') as f:
+                audio = self.decoder.decode(f.read())
+            return self._transcribe_speech(audio)
         except Exception as e:
             print(f"Error transcribing audio file: {e}")
             return None
@@ -29,24 +48,22 @@ class SpeechToText:
     def transcribe_audio_data(self, audio_data):
         """Transcribe audio data from bytes using Whisper"""
         try:
-            # Save audio data to temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-                temp_file.write(audio_data)
-                temp_file_path = temp_file.name
-            
-            # Transcribe the temporary file
-            result = self.whisper_model.transcribe(temp_file_path)
-            
-            # Clean up temporary file
-            os.unlink(temp_file_path)
-            
-            return result["text"].strip()
+            # Decode straight to a float32 array; no temporary files
+            audio = self.decoder.decode(audio_data)
+            return self._transcribe_speech(audio)
         except Exception as e:
             print(f"Error transcribing audio data: {e}")
             return None
     
     def listen_from_microphone(self, timeout=5, phrase_time_limit=15):
         """Listen to microphone and return transcribed text"""
+        if Config.STT_STREAMING:
+            final_text = None
+            for transcript in self.stream_from_microphone(timeout, phrase_time_limit):
+                if transcript['is_final']:
+                    final_text = transcript['text']
+            return final_text
+        
         try:
             print("Listening...")
             with self.microphone as source:
@@ -58,9 +75,9 @@ class SpeechToText:
                 )
             
             print("Transcribing...")
-            # Convert audio to text using Whisper
-            audio_data = audio.get_wav_data()
-            return self.transcribe_audio_data(audio_data)
+            # Let speech_recognition resample to 16 kHz and skip the WAV container
+            pcm_data = audio.get_raw_data(convert_rate=WHISPER_SAMPLE_RATE, convert_width=2)
+            return self._transcribe_speech(self.decoder.decode_pcm(pcm_data, WHISPER_SAMPLE_RATE))
             
         except sr.WaitTimeoutError:
             print("No speech detected within timeout period")
@@ -69,29 +86,176 @@ class SpeechToText:
             print(f"Error during speech recognition: {e}")
             return None
     
-    def transcribe_webm_to_text(self, webm_data):
-        """Convert WebM audio data to text"""
+    def stream_from_microphone(self, timeout=5, phrase_time_limit=15):
+        """Listen to microphone and yield partial and final transcripts while the user speaks
+
+        Each item is a dict with 'text' (best current hypothesis), 'stable_text'
+        (prefix that agreed across two consecutive passes) and 'is_final'.
+        """
+        frames = queue.Queue()
+        stop_event = threading.Event()
+        
+        try:
+            with self.microphone as source:
+                # Read audio on a separate thread so frames keep arriving while Whisper runs
+                reader = threading.Thread(
+                    target=self._read_microphone,
+                    args=(source, frames, stop_event),
+                    daemon=True
+                )
+                reader.start()
+                try:
+                    yield from self._stream_transcripts(
+                        frames, source.SAMPLE_RATE, source.CHUNK, timeout, phrase_time_limit
+                    )
+                finally:
+                    stop_event.set()
+                    reader.join()
+        except Exception as e:
+            print(f"Error during streaming speech recognition: {e}")
+    
+    def _read_microphone(self, source, frames, stop_event):
+        """Push raw microphone chunks onto a queue until stopped"""
         try:
-            # Create temporary files
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.webm') as webm_file:
-                webm_file.write(webm_data)
-                webm_path = webm_file.name
+            while not stop_event.is_set():
+                frames.put(source.stream.read(source.CHUNK))
+        except Exception as e:
+            print(f"Error reading from microphone: {e}")
+        finally:
+            frames.put(None)
+    
+    def _stream_transcripts(self, frames, sample_rate, chunk_size, timeout, phrase_time_limit):
+        """Transcribe a sliding window over incoming frames, committing text at pauses"""
+        pre_roll = deque(maxlen=max(1, int(Config.STT_PRE_ROLL * sample_rate / chunk_size)))
+        
+        speech_started = False
+        waited = 0.0
+        speech_duration = 0.0
+        silence = 0.0
+        since_partial = 0.0
+        
+        segment = []        # float32 chunks not yet committed
+        segment_duration = 0.0
+        last_pause = 0      # index into segment just after the most recent quiet chunk
+        committed = []      # text already finalized for earlier windows
+        previous_words = []
+        # One resampler for the whole stream so its filter runs across chunk boundaries
+        resampler = Resampler(sample_rate, WHISPER_SAMPLE_RATE) if sample_rate != WHISPER_SAMPLE_RATE else None
+        # Seed the VAD from the calibrated ambient level, not from the first chunk (which may be speech)
+        threshold = self.recognizer.energy_threshold / 32768.0
+        vad_state = self.vad.new_state(noise_floor=threshold / self.vad.threshold_ratio)
+        
+        while True:
+            chunk = frames.get()
+            if chunk is None:
+                break
+            
+            audio = self.decoder.decode_pcm(chunk, sample_rate, copy=True, resampler=resampler)
+            duration = len(chunk) / 2 / sample_rate
+            is_speech = self.vad.is_speech(audio, min_threshold=threshold, state=vad_state)
+            
+            if not speech_started:
+                pre_roll.append(audio)
+                waited += duration
+                if is_speech:
+                    speech_started = True
+                    segment.extend(pre_roll)
+                    segment_duration = sum(len(a) for a in segment) / WHISPER_SAMPLE_RATE
+                elif timeout and waited > timeout:
+                    print("No speech detected within timeout period")
+                    return
+                continue
             
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as wav_file:
-                wav_path = wav_file.name
+            segment.append(audio)
+            segment_duration += duration
+            speech_duration += duration
+            since_partial += duration
             
-            # Convert WebM to WAV using pydub
-            audio = AudioSegment.from_file(webm_path, format="webm")
-            audio.export(wav_path, format="wav")
+            if is_speech:
+                silence = 0.0
+            else:
+                silence += duration
+                last_pause = len(segment)
             
-            # Transcribe the WAV file
-            result = self.whisper_model.transcribe(wav_path)
+            # End of utterance
+            if silence >= Config.STT_END_SILENCE or speech_duration >= phrase_time_limit:
+                break
             
-            # Clean up temporary files
-            os.unlink(webm_path)
-            os.unlink(wav_path)
+            # Window is full: commit everything up to the last pause and slide forward
+            if segment_duration >= Config.STT_STREAM_WINDOW:
+                cut = last_pause if last_pause > 0 else len(segment)
+                text = self._transcribe_array(np.concatenate(segment[:cut]))
+                if text:
+                    committed.append(text)
+                segment = segment[cut:]
+                segment_duration = sum(len(a) for a in segment) / WHISPER_SAMPLE_RATE
+                last_pause = 0
+                previous_words = []
+                since_partial = 0.0
+                continue
             
+            # Periodic partial hypothesis over the current window
+            if since_partial >= Config.STT_PARTIAL_INTERVAL:
+                since_partial = 0.0
+                hypothesis = self._transcribe_array(np.concatenate(segment)) or ""
+                words = hypothesis.split()
+                
+                stable_words = []
+                for previous, current in zip(previous_words, words):
+                    if previous != current:
+                        break
+                    stable_words.append(current)
+                previous_words = words
+                
+                yield {
+                    'text': " ".join(committed + [hypothesis]).strip(),
+                    'stable_text': " ".join(committed + stable_words).strip(),
+                    'is_final': False
+                }
+        
+        if not speech_started:
+            return
+        
+        # Only the audio since the last commit needs decoding here
+        if segment:
+            tail = self._transcribe_array(np.concatenate(segment))
+            if tail:
+                committed.append(tail)
+        
+        final_text = " ".join(committed).strip()
+        yield {
+            'text': final_text,
+            'stable_text': final_text,
+            'is_final': True
+        }
+    
+    def _transcribe_speech(self, audio):
+        """Trim silence from an utterance and transcribe it, skipping silence-only audio"""
+        speech = self.vad.trim(audio)
+        if speech is None:
+            print("No speech detected in audio")
+            return None
+        return self._transcribe_array(speech)
+    
+    def _transcribe_array(self, audio):
+        """Transcribe a float32 16 kHz audio array using Whisper"""
+        try:
+            if self.worker_pool is not None:
+                return self.worker_pool.transcribe(audio)
+            if self.batch_service is not None:
+                return self.batch_service.transcribe(audio)
+            
+            result = self.whisper_model.transcribe(audio, **self.transcribe_options)
             return result["text"].strip()
+        except Exception as e:
+            print(f"Error transcribing audio array: {e}")
+            return None
+    
+    def transcribe_webm_to_text(self, webm_data):
+        """Convert WebM audio data to text"""
+        try:
+            audio = self.decoder.decode(webm_data, format_hint='webm')
+            return self._transcribe_speech(audio)
             
         except Exception as e:
             print(f"Error transcribing WebM audio: {e}")
@@ -100,17 +264,13 @@ class SpeechToText:
     def is_speech_detected(self, audio_data, threshold=0.01):
         """Check if audio data contains speech above threshold"""
         try:
-            # Convert audio data to numpy array
-            audio_array = np.frombuffer(audio_data, dtype=np.int16)
-            
-            # Calculate RMS (Root Mean Square) for volume detection
-            rms = np.sqrt(np.mean(audio_array**2))
-            
-            # Normalize RMS to 0-1 range
-            normalized_rms = rms / 32767.0
+            # Widen int16 samples to float before squaring so loud audio cannot overflow
+            audio_array = np.frombuffer(audio_data, dtype=np.int16).astype(np.float32) / 32768.0
             
-            return normalized_rms > threshold
+            # Absolute level check: a single buffer carries no noise-floor history
+            rms = float(np.sqrt(np.mean(audio_array * audio_array))) if len(audio_array) else 0.0
+            return rms > threshold
             
         except Exception as e:
             print(f"Error detecting speech: {e}")
-            return False
\ No newline at end of file
+            return False
@@ -0,0 +1,105 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional
+import numpy as np
+from config import Config
+
+# Whisper model and transcribe options set up once in each worker process by _init_worker
+_worker_model = None
+_worker_options = {}
+
+def _init_worker(model_name: str, profile_name: str, torch_threads: int):
+    """Load Whisper once per worker and pin its intra-op thread count"""
+    global _worker_model, _worker_options
+    import torch
+    from src.whisper_profiles import load_whisper_model, get_transcribe_options
+
+    torch.set_num_threads(torch_threads)
+    _worker_model = load_whisper_model(model_name, profile_name)
+    _worker_options = get_transcribe_options(_worker_model, profile_name)
+
+def _warm_up() -> bool:
+    """No-op task used to force worker start-up"""
+    return _worker_model is not None
+
+def _transcribe_shared(shm_name: str, length: int) -> str:
+    """Transcribe an audio array that the parent placed in shared memory"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        view = np.ndarray((length,), dtype=np.float32, buffer=shm.buf)
+        # Whisper keeps torch views of its input, so detach from the segment before closing it
+        audio = view.copy()
+        del view
+    finally:
+        shm.close()
+
+    result = _worker_model.transcribe(audio, **_worker_options)
+    return result["text"].strip()
+
+
+class STTWorkerPool:
+    """Multi-process Whisper backend fed through shared memory with bounded backpressure"""
+
+    def __init__(self, num_workers: int = None, torch_threads: int = None,
+                 max_pending: int = None, model_name: str = None, profile_name: str = None):
+        self.num_workers = num_workers or Config.STT_WORKERS
+        self.torch_threads = torch_threads or Config.STT_TORCH_THREADS
+        self.max_pending = max_pending or Config.STT_MAX_PENDING
+        self.queue_timeout = Config.STT_QUEUE_TIMEOUT
+
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(model_name or Config.WHISPER_MODEL, profile_name or Config.STT_PROFILE, self.torch_threads)
+        )
+
+        # Start every worker now so model loading is not paid on the first turn
+        warm_ups = [self._executor.submit(_warm_up) for _ in range(self.num_workers)]
+        for future in warm_ups:
+            future.result()
+
+    def submit(self, audio: np.ndarray) -> Future:
+        """Queue a float32 16 kHz utterance; blocks while max_pending requests are in flight"""
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise RuntimeError("STT worker queue is full")
+
+        try:
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, audio.nbytes))
+            np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)[:] = audio
+            future = self._executor.submit(_transcribe_shared, shm.name, len(audio))
+        except Exception:
+            self._slots.release()
+            raise
+
+        def release(_):
+            shm.close()
+            shm.unlink()
+            self._slots.release()
+
+        future.add_done_callback(release)
+        return future
+
+    def transcribe(self, audio: np.ndarray, timeout: float = None) -> str:
+        """Transcribe an utterance on a worker process and wait for the text"""
+        return self.submit(audio).result(timeout=timeout)
+
+    def shutdown(self):
+        """Stop all worker processes"""
+        self._executor.shutdown(wait=True)
+
+
+_pool: Optional[STTWorkerPool] = None
+_pool_lock = threading.Lock()
+
+def get_stt_worker_pool() -> STTWorkerPool:
+    """Get the process-wide STT worker pool, starting it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = STTWorkerPool()
+        return _pool
@@ -0,0 +1,91 @@
+import re
+from typing import Iterable, Iterator, List
+
+# Sentence-ending punctuation (plus closing quotes/brackets) followed by whitespace
+SENTENCE_BOUNDARY = re.compile(r'[.!?…]+["\'\)\]”’]*\s+')
+# Clause punctuation used to break up overly long sentences
+CLAUSE_BOUNDARY = re.compile(r'[,;:—]\s+')
+# Characters that may still turn into a sentence boundary once more text arrives
+TRAILING_BOUNDARY_CHARS = '.!?…"\')]”’'
+
+ABBREVIATIONS = {
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'vs', 'etc',
+    'e.g', 'i.e', 'inc', 'ltd', 'co', 'no', 'approx', 'dept', 'fig'
+}
+
+class SentenceSegmenter:
+    """Incrementally split streamed text into sentences in a single pass"""
+
+    def __init__(self, min_length: int = 0, max_length: int = None):
+        self.min_length = min_length
+        self.max_length = max_length
+        self._buffer = ""
+        self._pending = ""  # complete sentences held back until min_length is reached
+        self._scan_from = 0
+
+    def feed(self, text: str) -> List[str]:
+        """Add text and return the sentences it completed"""
+        self._buffer += text
+        sentences = []
+        start = 0
+
+        for match in SENTENCE_BOUNDARY.finditer(self._buffer, self._scan_from):
+            if self._ends_with_abbreviation(self._buffer, start, match.start()):
+                continue
+            self._emit(self._buffer[start:match.end()], sentences)
+            start = match.end()
+
+        # Overlong text with no sentence end is cut at a clause or word boundary
+        while self.max_length and len(self._buffer) - start > self.max_length:
+            cut = self._find_cut(self._buffer, start, start + self.max_length)
+            self._emit(self._buffer[start:cut], sentences)
+            start = cut
+
+        self._buffer = self._buffer[start:]
+        self._scan_from = len(self._buffer.rstrip(TRAILING_BOUNDARY_CHARS))
+        return sentences
+
+    def flush(self) -> List[str]:
+        """Return whatever text remains once the stream has ended"""
+        remainder = (self._pending + self._buffer).strip()
+        self._pending = ""
+        self._buffer = ""
+        self._scan_from = 0
+        return [remainder] if remainder else []
+
+    def _emit(self, text: str, sentences: List[str]):
+        """Append a sentence, merging it with held-back text shorter than min_length"""
+        self._pending += text
+        if len(self._pending.strip()) >= self.min_length:
+            sentences.append(self._pending.strip())
+            self._pending = ""
+
+    def _ends_with_abbreviation(self, text: str, start: int, end: int) -> bool:
+        """Check whether the word before a boundary is a known abbreviation"""
+        word_start = text.rfind(' ', start, end) + 1
+        word = text[max(word_start, start):end].lower()
+        return word in ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+    def _find_cut(self, text: str, start: int, limit: int) -> int:
+        """Find the best place to cut text[start:limit]"""
+        clause_end = None
+        for match in CLAUSE_BOUNDARY.finditer(text, start, limit):
+            clause_end = match.end()
+        if clause_end and clause_end > start:
+            return clause_end
+
+        space = text.rfind(' ', start, limit)
+        return space + 1 if space > start else limit
+
+
+def split_sentences(text: str, min_length: int = 0, max_length: int = None) -> List[str]:
+    """Split a complete text into sentences"""
+    segmenter = SentenceSegmenter(min_length, max_length)
+    return segmenter.feed(text) + segmenter.flush()
+
+def iter_sentences(pieces: Iterable[str], min_length: int = 0, max_length: int = None) -> Iterator[str]:
+    """Yield sentences from an iterable of text pieces as soon as each one is complete"""
+    segmenter = SentenceSegmenter(min_length, max_length)
+    for piece in pieces:
+        yield from segmenter.feed(piece)
+    yield from segmenter.flush()
@@ -1,14 +1,25 @@
-import os
-import tempfile
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import pygame
 from elevenlabs import generate, save, set_api_key, voices
 from gtts import gTTS
 import io
+from src.text_segmenter import iter_sentences
+from src.tts_cache import TTSCache
+from src.audio_player import AudioPlayer
 from config import Config
 
+# How often a blocked feeder re-checks the stop flag, and how long a cancelled stream waits for it
+STOP_POLL_INTERVAL = 0.1
+STOP_JOIN_TIMEOUT = 0.5
+
 class TextToSpeech:
     def __init__(self):
         self.use_elevenlabs = bool(Config.ELEVENLABS_API_KEY)
+        self.elevenlabs_model = "eleven_monolingual_v1"
+        self.language = 'en'
+        self.cache = TTSCache() if Config.TTS_CACHE_ENABLED else None
         
         if self.use_elevenlabs:
             set_api_key(Config.ELEVENLABS_API_KEY)
@@ -18,6 +29,7 @@ class TextToSpeech:
         pygame.mixer.init(frequency=Config.SAMPLE_RATE, 
                           size=-16, channels=2, 
                           buffer=Config.CHUNK_SIZE)
+        self.player = AudioPlayer()
     
     def generate_speech_elevenlabs(self, text):
         """Generate speech using ElevenLabs API"""
@@ -25,7 +37,7 @@ class TextToSpeech:
             audio = generate(
                 text=text,
                 voice=self.voice_id,
-                model="eleven_monolingual_v1"
+                model=self.elevenlabs_model
             )
             return audio
         except Exception as e:
@@ -46,44 +58,157 @@ class TextToSpeech:
     
     def text_to_speech(self, text):
         """Convert text to speech and return audio data"""
+        cache_key = self._cache_key(text) if self.cache else None
+        if cache_key:
+            audio_data = self.cache.get(cache_key)
+            if audio_data:
+                return audio_data
+        
         if self.use_elevenlabs:
-            return self.generate_speech_elevenlabs(text)
+            audio_data = self.generate_speech_elevenlabs(text)
         else:
-            return self.generate_speech_gtts(text)
+            audio_data = self.generate_speech_gtts(text, self.language)
+        
+        if cache_key and audio_data:
+            self.cache.put(cache_key, audio_data)
+        return audio_data
+    
+    def _cache_key(self, text):
+        """Cache key covering everything that changes the synthesized audio"""
+        if self.use_elevenlabs:
+            return TTSCache.make_key('elevenlabs', self.voice_id, self.elevenlabs_model, text)
+        return TTSCache.make_key('gtts', 'gtts', self.language, text)
+    
+    def precompute_phrases(self, phrases, background=True):
+        """Synthesize known static phrases into the cache ahead of time"""
+        if not self.cache:
+            return None
+        
+        def synthesize_all():
+            with ThreadPoolExecutor(max_workers=Config.TTS_STREAM_WORKERS) as executor:
+                results = list(executor.map(self.text_to_speech, phrases))
+            print(f"Pre-synthesized {sum(1 for r in results if r)}/{len(phrases)} static phrases")
+        
+        if not background:
+            synthesize_all()
+            return None
+        
+        thread = threading.Thread(target=synthesize_all, daemon=True)
+        thread.start()
+        return thread
+    
+    def stream_text_to_speech(self, text):
+        """Synthesize text sentence by sentence and yield audio chunks in order
+
+        Accepts a complete string or an iterable of text pieces (e.g. streamed
+        LLM output). Up to TTS_STREAM_WORKERS sentences are synthesized
+        concurrently while earlier chunks are being consumed.
+        """
+        pieces = [text] if isinstance(text, str) else text
+        sentences = iter_sentences(pieces, Config.TTS_MIN_SEGMENT_LENGTH, Config.TTS_MAX_SEGMENT_LENGTH)
+        
+        # Futures in sentence order; the bound limits how far synthesis runs ahead
+        pending = queue.Queue(maxsize=Config.TTS_STREAM_WORKERS)
+        stop_event = threading.Event()
+        
+        executor = ThreadPoolExecutor(max_workers=Config.TTS_STREAM_WORKERS)
+        # Daemon: a stalled text iterator must not keep the process (or this generator) alive
+        feeder = threading.Thread(
+            target=self._submit_sentences,
+            args=(sentences, executor, pending, stop_event),
+            daemon=True
+        )
+        feeder.start()
+        
+        try:
+            while True:
+                future = pending.get()
+                if future is None:
+                    break
+                audio_data = future.result()
+                if audio_data:
+                    yield audio_data
+        finally:
+            stop_event.set()
+            # The feeder notices the stop flag between puts; if it is stuck inside the
+            # text iterator, leave it behind rather than blocking the caller
+            feeder.join(timeout=STOP_JOIN_TIMEOUT)
+            while True:
+                try:
+                    future = pending.get_nowait()
+                except queue.Empty:
+                    break
+                if future is not None:
+                    future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _submit_sentences(self, sentences, executor, pending, stop_event):
+        """Submit each sentence for synthesis as soon as it is available"""
+        try:
+            for sentence in sentences:
+                if stop_event.is_set():
+                    return
+                future = executor.submit(self.text_to_speech, sentence)
+                if not self._put_until_stopped(pending, future, stop_event):
+                    future.cancel()
+                    return
+        except Exception as e:
+            if not stop_event.is_set():
+                print(f"Error splitting text for speech: {e}")
+        self._put_until_stopped(pending, None, stop_event)
+    
+    @staticmethod
+    def _put_until_stopped(pending, item, stop_event):
+        """Put an item on a bounded queue, giving up once the consumer has stopped"""
+        while not stop_event.is_set():
+            try:
+                pending.put(item, timeout=STOP_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def speak_text_streaming(self, text, wait=True):
+        """Speak text sentence by sentence, synthesizing the next sentence during playback"""
+        handle = self.player.open_stream()
+        try:
+            spoke = False
+            for audio_data in self.stream_text_to_speech(text):
+                if handle.cancelled:
+                    break
+                handle.add_chunk(audio_data)
+                spoke = True
+            return spoke
+        except Exception as e:
+            print(f"Error speaking text: {e}")
+            return False
+        finally:
+            handle.close()
+            if wait:
+                handle.wait()
     
     def speak_text(self, text):
         """Convert text to speech and play it immediately"""
         try:
             audio_data = self.text_to_speech(text)
             if audio_data:
-                self.play_audio(audio_data)
+                self.play_audio(audio_data, wait=True)
                 return True
             return False
         except Exception as e:
             print(f"Error speaking text: {e}")
             return False
     
-    def play_audio(self, audio_data):
-        """Play audio data using pygame"""
+    def play_audio(self, audio_data, wait=False):
+        """Play audio data from memory and return a PlaybackHandle without blocking"""
         try:
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as temp_file:
-                temp_file.write(audio_data)
-                temp_file_path = temp_file.name
-            
-            # Load and play audio
-            pygame.mixer.music.load(temp_file_path)
-            pygame.mixer.music.play()
-            
-            # Wait for playback to finish
-            while pygame.mixer.music.get_busy():
-                pygame.time.wait(100)
-            
-            # Clean up temporary file
-            os.unlink(temp_file_path)
-            
+            handle = self.player.play(audio_data)
+            if wait:
+                handle.wait()
+            return handle
         except Exception as e:
             print(f"Error playing audio: {e}")
+            return None
     
     def save_audio_file(self, text, filename):
         """Generate speech and save to file"""
@@ -0,0 +1,128 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+import numpy as np
+import torch
+import whisper
+from src.whisper_profiles import load_whisper_model, get_transcribe_options, get_decoding_options
+from config import Config
+
+class BatchTranscriptionService:
+    """Shared scheduler that decodes utterances from many sessions in padded Whisper batches"""
+
+    def __init__(self, model=None, max_batch_size: int = None, max_wait: float = None):
+        self.model = model if model is not None else load_whisper_model()
+        self.max_batch_size = max_batch_size or Config.STT_BATCH_MAX_SIZE
+        self.max_wait = max_wait if max_wait is not None else Config.STT_BATCH_MAX_WAIT
+        self.decoding_options = get_decoding_options(self.model)
+        self.transcribe_options = get_transcribe_options(self.model)
+
+        self._queue = queue.Queue()
+        self._stats = {'batches': 0, 'utterances': 0, 'long_utterances': 0}
+        self._stats_lock = threading.Lock()
+
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, audio: np.ndarray) -> Future:
+        """Queue a float32 16 kHz utterance and return a future for its transcript
+
+        The audio is copied, so callers may pass views into reusable buffers.
+        """
+        future = Future()
+        self._queue.put((np.array(audio, dtype=np.float32, order='C', copy=True), future))
+        return future
+
+    def transcribe(self, audio: np.ndarray, timeout: float = None) -> str:
+        """Queue an utterance and block until its transcript is ready"""
+        return self.submit(audio).result(timeout=timeout)
+
+    def shutdown(self):
+        """Stop the worker after the queued utterances are decoded"""
+        self._queue.put(None)
+        self._worker.join()
+
+    def get_statistics(self) -> dict:
+        """Get batching statistics"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['average_batch_size'] = (
+            stats['utterances'] / stats['batches'] if stats['batches'] else 0.0
+        )
+        return stats
+
+    def _run(self):
+        """Collect queued utterances into batches and decode them"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._decode_batch(batch)
+
+            if stopping:
+                return
+
+    def _decode_batch(self, batch: List[Tuple[np.ndarray, Future]]):
+        """Run one batched encoder/decoder pass over the utterances in a batch"""
+        pending = [(audio, future) for audio, future in batch if future.set_running_or_notify_cancel()]
+        short = [(audio, future) for audio, future in pending if len(audio) <= whisper.audio.N_SAMPLES]
+        long = [(audio, future) for audio, future in pending if len(audio) > whisper.audio.N_SAMPLES]
+
+        if short:
+            try:
+                mel = torch.stack([
+                    whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), self.model.dims.n_mels)
+                    for audio, _ in short
+                ]).to(self.model.device)
+                results = whisper.decode(self.model, mel, self.decoding_options)
+                for (_, future), result in zip(short, results):
+                    future.set_result(result.text.strip())
+            except Exception as e:
+                print(f"Error decoding transcription batch: {e}")
+                for _, future in short:
+                    future.set_exception(e)
+
+        # Utterances over 30 seconds need Whisper's sliding-window transcribe
+        for audio, future in long:
+            try:
+                result = self.model.transcribe(audio, **self.transcribe_options)
+                future.set_result(result["text"].strip())
+            except Exception as e:
+                future.set_exception(e)
+
+        with self._stats_lock:
+            self._stats['batches'] += 1
+            self._stats['utterances'] += len(pending)
+            self._stats['long_utterances'] += len(long)
+
+
+_service: Optional[BatchTranscriptionService] = None
+_service_lock = threading.Lock()
+
+def get_transcription_service() -> BatchTranscriptionService:
+    """Get the process-wide transcription service, creating it on first use"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = BatchTranscriptionService()
+        return _service
@@ -0,0 +1,146 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from config import Config
+
+class TTSCache:
+    """Content-addressed LRU cache for synthesized speech, in memory and on disk"""
+
+    def __init__(self, cache_dir: str = None, max_memory_bytes: int = None, max_disk_bytes: int = None):
+        self.cache_dir = cache_dir or Config.TTS_CACHE_DIR
+        self.max_memory_bytes = max_memory_bytes or Config.TTS_CACHE_MEMORY_BYTES
+        self.max_disk_bytes = max_disk_bytes or Config.TTS_CACHE_DISK_BYTES
+        self.extension = Config.AUDIO_FORMAT
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> audio bytes, least recently used first
+        self._memory_bytes = 0
+        self._disk = OrderedDict()  # key -> file size, least recently used first
+        self._disk_bytes = 0
+        self._stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_disk_index()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Collapse whitespace so trivially different strings share an entry"""
+        return " ".join(text.split())
+
+    @classmethod
+    def make_key(cls, provider: str, voice_id: str, model: str, text: str) -> str:
+        """Build the cache key for a synthesis request"""
+        raw = "\0".join([provider or "", voice_id or "", model or "", cls.normalize_text(text)])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Look up audio by key, promoting disk hits into memory"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats['memory_hits'] += 1
+                return self._memory[key]
+
+            if key not in self._disk:
+                self._stats['misses'] += 1
+                return None
+            self._disk.move_to_end(key)
+
+        try:
+            with open(self._path(key), 'rb') as f:
+                audio_data = f.read()
+            # Keep recency across restarts, since the disk index is rebuilt from mtimes
+            os.utime(self._path(key), None)
+        except OSError:
+            with self._lock:
+                self._forget_disk_entry(key)
+                self._stats['misses'] += 1
+            return None
+
+        with self._lock:
+            self._stats['disk_hits'] += 1
+            self._store_in_memory(key, audio_data)
+        return audio_data
+
+    def put(self, key: str, audio_data: bytes):
+        """Store audio in memory and on disk"""
+        with self._lock:
+            self._store_in_memory(key, audio_data)
+            if key in self._disk:
+                return
+
+        path = self._path(key)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(audio_data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error writing TTS cache entry: {e}")
+            return
+
+        with self._lock:
+            self._disk[key] = len(audio_data)
+            self._disk_bytes += len(audio_data)
+            self._evict_disk()
+
+    def get_statistics(self) -> Dict:
+        """Get cache hit/miss counters and sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'disk_entries': len(self._disk),
+                'disk_bytes': self._disk_bytes
+            })
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['memory_hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{self.extension}")
+
+    def _load_disk_index(self):
+        """Rebuild the disk LRU order from file modification times"""
+        entries = []
+        suffix = f".{self.extension}"
+        for filename in os.listdir(self.cache_dir):
+            if not filename.endswith(suffix):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, filename))
+            entries.append((stat.st_mtime, filename[:-len(suffix)], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def _store_in_memory(self, key: str, audio_data: bytes):
+        """Insert into the memory LRU and evict until under budget (lock held)"""
+        if len(audio_data) > self.max_memory_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= len(self._memory.pop(key))
+        self._memory[key] = audio_data
+        self._memory_bytes += len(audio_data)
+
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _evict_disk(self):
+        """Delete least recently used files until under budget (lock held)"""
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            key = next(iter(self._disk))
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            self._forget_disk_entry(key)
+
+    def _forget_disk_entry(self, key: str):
+        if key in self._disk:
+            self._disk_bytes -= self._disk.pop(key)
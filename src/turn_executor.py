@@ -0,0 +1,109 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List
+from config import Config
+
+# Waits shorter than this are not counted as blocking the turn
+BLOCKING_THRESHOLD = 0.001
+
+class Turn:
+    """Timed stages of one conversational turn, some running in the background"""
+
+    def __init__(self, executor: ThreadPoolExecutor):
+        self._executor = executor
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+        self._stages: Dict[str, Dict] = {}
+        self._critical_path: List[str] = []
+        self._cancel_events: Dict[str, threading.Event] = {}
+
+    def cancel_event(self, name: str) -> threading.Event:
+        """Event set when a stage is cancelled; background stages check it between steps"""
+        with self._lock:
+            return self._cancel_events.setdefault(name, threading.Event())
+
+    def start(self, name: str, fn: Callable, *args, **kwargs) -> Future:
+        """Run a stage on the executor and return its future"""
+        future = self._executor.submit(self._timed, name, False, fn, *args, **kwargs)
+        self._futures[name] = future
+        return future
+
+    def run(self, name: str, fn: Callable, *args, **kwargs):
+        """Run a stage on the calling thread; it is always on the critical path"""
+        return self._timed(name, True, fn, *args, **kwargs)
+
+    def result(self, name: str):
+        """Wait for a background stage, recording how long the turn was blocked on it"""
+        wait_start = time.perf_counter()
+        try:
+            return self._futures[name].result()
+        finally:
+            blocked = time.perf_counter() - wait_start
+            with self._lock:
+                self._stages.setdefault(name, {})['blocked'] = blocked
+                if blocked >= BLOCKING_THRESHOLD:
+                    self._critical_path.append(name)
+
+    def cancel(self, name: str):
+        """Cancel a background stage: drop it if queued, or signal it to stop early"""
+        self.cancel_event(name).set()
+        future = self._futures.get(name)
+        cancelled = future is not None and future.cancel()
+        with self._lock:
+            stage = self._stages.setdefault(name, {})
+            stage['cancelled'] = True
+            if cancelled:
+                stage['started'] = False
+
+    def report(self) -> Dict:
+        """Per-stage timings in seconds relative to the turn start, plus the critical path"""
+        total = time.perf_counter() - self._start
+        with self._lock:
+            stages = {name: dict(stage) for name, stage in self._stages.items()}
+            critical_path = list(self._critical_path)
+
+        background = sum(
+            stage.get('duration', 0.0) for stage in stages.values() if not stage.get('inline')
+        )
+        blocked = sum(stage.get('blocked', 0.0) for stage in stages.values())
+        return {
+            'total': total,
+            'stages': stages,
+            'critical_path': critical_path,
+            'overlapped': max(0.0, background - blocked)  # background time hidden behind other work
+        }
+
+    def _timed(self, name: str, inline: bool, fn: Callable, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            ended = time.perf_counter()
+            with self._lock:
+                stage = self._stages.setdefault(name, {})
+                stage.update({
+                    'start': started - self._start,
+                    'end': ended - self._start,
+                    'duration': ended - started,
+                    'inline': inline
+                })
+                if inline:
+                    self._critical_path.append(name)
+
+
+class TurnExecutor:
+    """Shared thread pool for running the independent stages of each turn concurrently"""
+
+    def __init__(self, max_workers: int = None):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or Config.TURN_EXECUTOR_WORKERS,
+            thread_name_prefix="turn-stage"
+        )
+
+    def new_turn(self) -> Turn:
+        return Turn(self._executor)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,97 @@
+from typing import Optional
+import numpy as np
+from src.audio_decoder import WHISPER_SAMPLE_RATE
+from config import Config
+
+class VADState:
+    """Noise floor and pending hangover of one clip or stream"""
+
+    def __init__(self, noise_floor: float = None):
+        self.noise_floor = noise_floor  # background RMS; None until known
+        self.hangover = 0               # frames still to be marked speech after the last speech frame
+
+
+class VoiceActivityDetector:
+    """Frame-level energy VAD with hangover smoothing and an adaptive noise floor
+
+    Each call analyses its audio as a clip of its own. To follow a stream, create a
+    state with new_state() and pass it with every chunk so the noise floor and the
+    hangover carry over between chunks. Until the noise floor is known (from a
+    calibration or from earlier quiet frames), min_threshold is the decision threshold;
+    it is never seeded from the audio being classified, which may be all speech.
+    """
+
+    def __init__(self, sample_rate: int = WHISPER_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.frame_length = max(1, int(sample_rate * Config.VAD_FRAME_DURATION))
+        self.hangover_frames = int(round(Config.VAD_HANGOVER / Config.VAD_FRAME_DURATION))
+        self.padding_samples = int(sample_rate * Config.VAD_PADDING)
+        self.threshold_ratio = Config.VAD_THRESHOLD_RATIO
+        self.min_threshold = Config.VAD_MIN_THRESHOLD
+        self.adapt_rate = Config.VAD_NOISE_ADAPT_RATE
+
+    def new_state(self, noise_floor: float = None) -> VADState:
+        """Start tracking a new stream, optionally from a calibrated ambient RMS"""
+        return VADState(noise_floor)
+
+    def frame_energies(self, audio: np.ndarray) -> np.ndarray:
+        """Compute the RMS of each non-overlapping frame of a float32 signal"""
+        frame_count = len(audio) // self.frame_length
+        if frame_count == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        frames = audio[:frame_count * self.frame_length].reshape(frame_count, self.frame_length)
+        return np.sqrt(np.einsum('ij,ij->i', frames, frames) / self.frame_length)
+
+    def speech_mask(self, audio: np.ndarray, min_threshold: float = None, state: VADState = None) -> np.ndarray:
+        """Classify each frame as speech (True) or silence (False)"""
+        if state is None:
+            state = VADState()
+        energies = self.frame_energies(audio)
+        if len(energies) == 0:
+            return np.zeros(0, dtype=bool)
+
+        if min_threshold is None:
+            min_threshold = self.min_threshold
+        if state.noise_floor is None:
+            # No ambient estimate yet: start where the threshold equals min_threshold
+            state.noise_floor = min_threshold / self.threshold_ratio
+        threshold = max(state.noise_floor * self.threshold_ratio, min_threshold)
+        mask = energies > threshold
+
+        # Track the noise floor using only frames classified as background
+        quiet = energies[~mask]
+        if len(quiet):
+            state.noise_floor += self.adapt_rate * (float(quiet.mean()) - state.noise_floor)
+
+        # Hangover: keep the next few frames after any speech frame as speech
+        speech_frames = np.flatnonzero(mask)
+        if self.hangover_frames > 0 and len(speech_frames):
+            kernel = np.ones(self.hangover_frames + 1, dtype=np.int32)
+            mask = np.convolve(mask.astype(np.int32), kernel)[:len(mask)] > 0
+        # ...including frames left over from speech at the end of the previous chunk
+        mask[:state.hangover] = True
+
+        state.hangover = max(0, state.hangover - len(mask))
+        if len(speech_frames):
+            trailing = len(mask) - 1 - int(speech_frames[-1])
+            state.hangover = max(state.hangover, self.hangover_frames - trailing)
+
+        return mask
+
+    def is_speech(self, audio: np.ndarray, min_threshold: float = None, state: VADState = None) -> bool:
+        """Check whether any frame of the signal contains speech"""
+        return bool(self.speech_mask(audio, min_threshold, state).any())
+
+    def trim(self, audio: np.ndarray) -> Optional[np.ndarray]:
+        """Strip leading and trailing silence; return None if there is no speech at all"""
+        mask = self.speech_mask(audio)
+        if not mask.any():
+            return None
+
+        first_frame = int(np.argmax(mask))
+        last_frame = len(mask) - int(np.argmax(mask[::-1]))
+
+        start = max(0, first_frame * self.frame_length - self.padding_samples)
+        end = min(len(audio), last_frame * self.frame_length + self.padding_samples)
+        return audio[start:end]
@@ -0,0 +1,239 @@
+import math
+import time
+from typing import Dict, List
+import faiss
+import numpy as np
+from config import Config
+
+INDEX_TYPES = ('flat', 'hnsw', 'ivf_flat', 'ivf_pq')
+VECTOR_STORAGE = ('float32', 'float16', 'pq')
+
+# Corpus sizes (chunks) at which the automatic rule moves to the next index type
+AUTO_INDEX_THRESHOLDS = [
+    (20_000, 'flat'),      # exact scan stays cheap and needs no tuning
+    (200_000, 'hnsw'),     # graph search, no training, more memory per vector
+    (2_000_000, 'ivf_flat')
+]
+
+# k-means in FAISS needs at least one training point per centroid; a PQ codebook has 2**8 centroids
+PQ_MIN_TRAINING_POINTS = 256
+# Points per IVF list below which FAISS warns that clustering is unreliable
+IVF_MIN_POINTS_PER_LIST = 39
+
+def training_size(num_vectors: int) -> int:
+    """Number of vectors train_index() will use for a corpus of this size"""
+    return min(num_vectors, Config.INDEX_TRAIN_SAMPLE_SIZE)
+
+def choose_index_type(num_vectors: int) -> str:
+    """Pick an index type for a corpus size"""
+    for limit, index_type in AUTO_INDEX_THRESHOLDS:
+        if num_vectors < limit:
+            return index_type
+    return 'ivf_pq'
+
+def default_nlist(num_vectors: int) -> int:
+    """Number of IVF lists: about 4 * sqrt(n), with enough training points per list"""
+    return max(1, min(int(4 * math.sqrt(num_vectors)), training_size(num_vectors) // IVF_MIN_POINTS_PER_LIST))
+
+def default_pq_m(dimension: int) -> int:
+    """Sub-quantizers for PQ: the configured count if it divides the dimension, else the nearest divisor below"""
+    m = min(Config.INDEX_PQ_M, dimension)
+    while dimension % m:
+        m -= 1
+    return m
+
+def create_index(dimension: int, num_vectors: int, index_type: str = None, storage: str = None) -> faiss.Index:
+    """Create an empty inner-product index of the given type ('auto' chooses by corpus size)
+
+    storage selects how the vectors themselves are kept: float32, float16 (scalar
+    quantizer, half the memory) or pq (product quantization, m bytes per vector).
+    HNSW has no inner-product PQ variant, so it uses float16 when pq is asked for,
+    as does any index with too few vectors to train PQ codebooks.
+    """
+    index_type = index_type or Config.INDEX_TYPE
+    storage = storage or Config.INDEX_VECTOR_STORAGE
+    if index_type == 'auto':
+        index_type = choose_index_type(num_vectors)
+    if storage not in VECTOR_STORAGE:
+        raise ValueError(f"Unknown vector storage: {storage} (expected one of {', '.join(VECTOR_STORAGE)})")
+    if index_type == 'ivf_pq':
+        if training_size(num_vectors) < PQ_MIN_TRAINING_POINTS:
+            # Too few vectors to train PQ codebooks; keep the IVF layout with compact float16 lists
+            index_type, storage = 'ivf_flat', 'float16'
+        else:
+            storage = 'pq'
+    if storage == 'pq' and training_size(num_vectors) < PQ_MIN_TRAINING_POINTS:
+        storage = 'float16'
+
+    if index_type == 'flat':
+        if storage == 'float16':
+            return faiss.IndexScalarQuantizer(dimension, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT)
+        if storage == 'pq':
+            return faiss.IndexPQ(dimension, default_pq_m(dimension), 8, faiss.METRIC_INNER_PRODUCT)
+        return faiss.IndexFlatIP(dimension)
+
+    if index_type == 'hnsw':
+        if storage == 'float32':
+            index = faiss.IndexHNSWFlat(dimension, Config.INDEX_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexHNSWSQ(dimension, faiss.ScalarQuantizer.QT_fp16, Config.INDEX_HNSW_M,
+                                      faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = Config.INDEX_HNSW_EF_CONSTRUCTION
+        return index
+
+    if index_type in ('ivf_flat', 'ivf_pq'):
+        nlist = default_nlist(num_vectors)
+        quantizer = faiss.IndexFlatIP(dimension)
+        if storage == 'pq':
+            index = faiss.IndexIVFPQ(quantizer, dimension, nlist, default_pq_m(dimension), 8, faiss.METRIC_INNER_PRODUCT)
+        elif storage == 'float16':
+            index = faiss.IndexIVFScalarQuantizer(quantizer, dimension, nlist, faiss.ScalarQuantizer.QT_fp16,
+                                                  faiss.METRIC_INNER_PRODUCT)
+        else:
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+        return index
+
+    raise ValueError(f"Unknown index type: {index_type} (expected 'auto' or one of {', '.join(INDEX_TYPES)})")
+
+def index_type_of(index: faiss.Index) -> str:
+    """Name of the index type for a built index"""
+    if isinstance(index, faiss.IndexHNSW):
+        return 'hnsw'
+    if isinstance(index, faiss.IndexIVFPQ):
+        return 'ivf_pq'
+    if isinstance(index, faiss.IndexIVF):
+        return 'ivf_flat'
+    return 'flat'
+
+def storage_of(index: faiss.Index) -> str:
+    """How a built index stores its vectors"""
+    if isinstance(index, faiss.IndexHNSW):
+        index = index.storage
+    if isinstance(index, (faiss.IndexPQ, faiss.IndexIVFPQ)):
+        return 'pq'
+    if isinstance(index, (faiss.IndexScalarQuantizer, faiss.IndexIVFScalarQuantizer)):
+        return 'float16'
+    return 'float32'
+
+def vector_bytes(index: faiss.Index) -> int:
+    """Bytes per vector held by the index, excluding graph links and list overhead"""
+    try:
+        return int(index.sa_code_size())
+    except RuntimeError:
+        return index.d * 4
+
+def reconstruct_all(index: faiss.Index) -> np.ndarray:
+    """Recover every stored vector (approximate for float16 and PQ storage)"""
+    if isinstance(index, faiss.IndexIVF):
+        index.make_direct_map()
+    return index.reconstruct_n(0, index.ntotal)
+
+def empty_like(index: faiss.Index) -> faiss.Index:
+    """Empty copy of a built index that keeps its training (coarse quantizer, PQ/SQ codebooks)
+
+    Re-adding reconstructed vectors to it reproduces their codes instead of training
+    new codebooks on already-quantized data. IVF inverted lists, which may be
+    memory-mapped, are never copied.
+    """
+    if isinstance(index, faiss.IndexIVF):
+        quantizer = faiss.clone_index(index.quantizer)
+        if isinstance(index, faiss.IndexIVFPQ):
+            copy = faiss.IndexIVFPQ(quantizer, index.d, index.nlist, index.pq.M, index.pq.nbits, index.metric_type)
+            copy.pq = index.pq
+        elif isinstance(index, faiss.IndexIVFScalarQuantizer):
+            copy = faiss.IndexIVFScalarQuantizer(quantizer, index.d, index.nlist, index.sq.qtype, index.metric_type)
+            copy.sq = index.sq
+        else:
+            copy = faiss.IndexIVFFlat(quantizer, index.d, index.nlist, index.metric_type)
+        copy.is_trained = True
+        copy.nprobe = index.nprobe
+        return copy
+
+    copy = faiss.clone_index(index)
+    copy.reset()
+    return copy
+
+def train_index(index: faiss.Index, embeddings: np.ndarray, sample_size: int = None, seed: int = 0):
+    """Train an index that needs it on a random sample of the vectors"""
+    if index.is_trained:
+        return
+
+    sample_size = sample_size or Config.INDEX_TRAIN_SAMPLE_SIZE
+    if len(embeddings) > sample_size:
+        rows = np.random.default_rng(seed).choice(len(embeddings), sample_size, replace=False)
+        sample = embeddings[np.sort(rows)]
+    else:
+        sample = embeddings
+    index.train(np.ascontiguousarray(sample, dtype=np.float32))
+
+def set_search_params(index: faiss.Index, nprobe: int = None, ef_search: int = None):
+    """Apply search-time accuracy/speed knobs; ignored by index types they don't apply to"""
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = ef_search or Config.INDEX_EF_SEARCH
+    elif isinstance(index, faiss.IndexIVF):
+        index.nprobe = min(nprobe or Config.INDEX_NPROBE, index.nlist)
+
+def build_index(embeddings: np.ndarray, index_type: str = None,
+                nprobe: int = None, ef_search: int = None, storage: str = None) -> faiss.Index:
+    """Create, train and fill an index over L2-normalized float32 embeddings"""
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    index = create_index(embeddings.shape[1], len(embeddings), index_type, storage)
+    train_index(index, embeddings)
+    index.add(embeddings)
+    set_search_params(index, nprobe, ef_search)
+    return index
+
+def evaluate_index(index: faiss.Index, reference: faiss.Index, queries: np.ndarray,
+                   top_k: int = None) -> Dict:
+    """Recall@k of an index against exact reference results, with per-query latency"""
+    top_k = min(top_k or Config.TOP_K_RESULTS, reference.ntotal)
+    _, expected = reference.search(queries, top_k)
+
+    latencies = []
+    found = np.empty_like(expected)
+    for i in range(len(queries)):
+        start = time.perf_counter()
+        _, found[i:i + 1] = index.search(queries[i:i + 1], top_k)
+        latencies.append(time.perf_counter() - start)
+
+    hits = sum(len(set(row_found) & set(row_expected)) for row_found, row_expected in zip(found.tolist(), expected.tolist()))
+    latencies = np.array(latencies) * 1000
+    return {
+        'index_type': index_type_of(index),
+        'recall': hits / (len(queries) * top_k),
+        'mean_ms': float(latencies.mean()),
+        'p95_ms': float(np.percentile(latencies, 95)),
+        'ntotal': index.ntotal
+    }
+
+def recall_latency_report(embeddings: np.ndarray, queries: np.ndarray = None,
+                          index_types: List[str] = None, top_k: int = None,
+                          num_queries: int = 200, nprobe: int = None,
+                          ef_search: int = None, seed: int = 0) -> List[Dict]:
+    """Build each index type over the embeddings and compare it with the exact flat index
+
+    Without explicit queries, a sample of the corpus vectors is used as queries.
+    """
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if queries is None:
+        rows = np.random.default_rng(seed).choice(len(embeddings), min(num_queries, len(embeddings)), replace=False)
+        queries = embeddings[rows]
+    queries = np.ascontiguousarray(queries, dtype=np.float32)
+
+    start = time.perf_counter()
+    reference = build_index(embeddings, 'flat')
+    reference_seconds = time.perf_counter() - start
+
+    report = []
+    for index_type in index_types or INDEX_TYPES:
+        if index_type == 'flat':
+            index, build_seconds = reference, reference_seconds
+        else:
+            start = time.perf_counter()
+            index = build_index(embeddings, index_type, nprobe, ef_search)
+            build_seconds = time.perf_counter() - start
+
+        result = evaluate_index(index, reference, queries, top_k)
+        result['build_seconds'] = build_seconds
+        report.append(result)
+    return report
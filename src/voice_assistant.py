@@ -3,44 +3,55 @@ import time
 from typing import Dict, Optional, Tuple
 from src.speech_to_text import SpeechToText
 from src.text_to_speech import TextToSpeech
-from src.llm_handler_groq import LLMHandler
+from src.llm_handler import LLMHandler
 from src.rag_engine import RAGEngine
 from src.memory_manager import MemoryManager
 from src.intent_recognizer import IntentRecognizer
 from config import Config
 
 class VoiceAssistant:
+    NO_SPEECH_MESSAGE = "I didn't catch that. Could you please repeat?"
+    ERROR_MESSAGE = "I encountered an error processing your request."
+    
     def __init__(self):
         # Initialize all components
         self.stt = SpeechToText()
         self.tts = TextToSpeech()
         self.llm = LLMHandler()
         self.rag = RAGEngine()
-        self.memory = MemoryManager()
+        self.memory = MemoryManager(summarize=self.llm.update_summary)
         self.intent_recognizer = IntentRecognizer()
         
         # Assistant state
         self.is_listening = False
         self.knowledge_base_loaded = False
         
+        # Warm the TTS cache with responses that never change
+        if Config.TTS_PRECOMPUTE_PHRASES:
+            self.tts.precompute_phrases(self.get_static_phrases())
+        
         print("Voice Assistant initialized successfully!")
     
     def load_knowledge_base(self, sources: list):
         """Load knowledge base from URLs or PDF files"""
         print("Loading knowledge base...")
         
+        urls, pdf_paths = [], []
         for source in sources:
             if source.startswith('http'):
-                self.rag.add_url(source)
+                urls.append(source)
             elif source.endswith('.pdf'):
-                self.rag.add_pdf(source)
+                pdf_paths.append(source)
             else:
                 print(f"Unsupported source format: {source}")
         
+        stats = self.rag.ingest(urls, pdf_paths)
+        print(f"Ingested {stats['pages']} pages into {stats['chunks']} chunks "
+              f"({stats['pages_per_second']:.1f} pages/s, {stats['chunks_per_second']:.1f} chunks/s)")
+        
         if self.rag.documents:
-            self.rag.build_index()
             self.knowledge_base_loaded = True
-            print(f"Knowledge base loaded with {len(self.rag.documents)} documents")
+            print(f"Knowledge base loaded with {self.rag.document_count} documents")
             
             # Print statistics
             stats = self.rag.get_statistics()
@@ -68,7 +79,7 @@ class VoiceAssistant:
                 return {
                     'success': False,
                     'error': 'No speech detected',
-                    'response_text': 'I didn\'t catch that. Could you please repeat?',
+                    'response_text': self.NO_SPEECH_MESSAGE,
                     'audio_data': None
                 }
             
@@ -89,7 +100,7 @@ class VoiceAssistant:
             return {
                 'success': False,
                 'error': str(e),
-                'response_text': 'I encountered an error processing your request.',
+                'response_text': self.ERROR_MESSAGE,
                 'audio_data': None
             }
     
@@ -116,6 +127,7 @@ class VoiceAssistant:
             
             # Step 5: Store assistant response
             self.memory.add_message(session_id, 'assistant', response)
+            self.memory.schedule_summary(session_id)
             
             return {
                 'success': True,
@@ -131,7 +143,7 @@ class VoiceAssistant:
             return {
                 'success': False,
                 'error': str(e),
-                'response_text': 'I encountered an error processing your request.',
+                'response_text': self.ERROR_MESSAGE,
                 'intent': 'error',
                 'confidence': 0.0,
                 'entities': {}
@@ -153,6 +165,7 @@ class VoiceAssistant:
             user_message=user_text,
             context=context,
             conversation_history=memory_context['conversation_history'],
+            summary=memory_context['context_summary'],
             user_profile=memory_context['user_profile']
         )
         
@@ -181,6 +194,16 @@ class VoiceAssistant:
         
         return f"Perfect! I have your information - {name} ({email}). I'll arrange for someone from our team to contact you within 24 hours to schedule a convenient time for your call. Is there anything specific you'd like to discuss during the call?"
     
+    def get_static_phrases(self) -> list:
+        """Get all fixed responses the assistant can speak"""
+        phrases = [self.NO_SPEECH_MESSAGE, self.ERROR_MESSAGE]
+        phrases.extend(
+            self._handle_human_handoff(None, intent, {})
+            for intent in ('complaint', 'contact_human', 'other')
+        )
+        phrases.extend(self.intent_recognizer.get_static_escalation_messages())
+        return phrases
+    
     def _handle_human_handoff(self, session_id: str, intent: str, entities: Dict) -> str:
         """Handle requests for human assistance"""
         
@@ -204,7 +227,9 @@ class VoiceAssistant:
             'session_duration': context['session_duration'],
             'user_profile': context['user_profile'],
             'recent_intents': [intent['intent'] for intent in recent_intents],
-            'conversation_summary': self.llm.summarize_conversation(context['conversation_history'])
+            'conversation_summary': self.llm.summarize_conversation(
+                context['conversation_history'], context['context_summary']
+            )
 
         }
     
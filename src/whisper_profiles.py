@@ -0,0 +1,77 @@
+from typing import Dict
+import torch
+import whisper
+from config import Config
+
+# Decoding profiles selectable through Config.STT_PROFILE
+STT_PROFILES = {
+    'accurate': {
+        'quantize': False,
+        'language': None,  # detect per utterance
+        'temperature': (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),  # Whisper's fallback schedule
+        'beam_size': None,
+        'condition_on_previous_text': True
+    },
+    'fast': {
+        'quantize': True,  # dynamic int8 Linear layers on CPU
+        'language': Config.STT_LANGUAGE,
+        'temperature': 0.0,  # greedy, no fallback re-decodes
+        'beam_size': None,
+        'condition_on_previous_text': False
+    }
+}
+
+def get_profile(profile_name: str = None) -> Dict:
+    """Look up a decoding profile by name"""
+    profile_name = profile_name or Config.STT_PROFILE
+    if profile_name not in STT_PROFILES:
+        raise ValueError(f"Unknown STT profile: {profile_name}")
+    return STT_PROFILES[profile_name]
+
+def load_whisper_model(model_name: str = None, profile_name: str = None):
+    """Load a Whisper model prepared for the given profile"""
+    profile = get_profile(profile_name)
+    model = whisper.load_model(model_name or Config.WHISPER_MODEL)
+
+    if profile['quantize'] and model.device.type == 'cpu':
+        model = _quantize_linear_layers(model)
+
+    return model
+
+def get_transcribe_options(model, profile_name: str = None) -> Dict:
+    """Keyword arguments for model.transcribe under the given profile"""
+    profile = get_profile(profile_name)
+    options = {
+        'temperature': profile['temperature'],
+        'condition_on_previous_text': profile['condition_on_previous_text'],
+        'fp16': model.device.type == 'cuda'
+    }
+    if profile['language']:
+        options['language'] = profile['language']
+    if profile['beam_size']:
+        options['beam_size'] = profile['beam_size']
+    return options
+
+def get_decoding_options(model, profile_name: str = None) -> whisper.DecodingOptions:
+    """DecodingOptions for a single batched whisper.decode pass under the given profile"""
+    profile = get_profile(profile_name)
+    temperature = profile['temperature']
+    if isinstance(temperature, (tuple, list)):
+        temperature = temperature[0]
+
+    return whisper.DecodingOptions(
+        language=profile['language'],
+        temperature=temperature,
+        beam_size=profile['beam_size'],
+        fp16=model.device.type == 'cuda',
+        without_timestamps=True
+    )
+
+def _quantize_linear_layers(model):
+    """Apply dynamic int8 quantization to the model's Linear layers"""
+    # Whisper subclasses nn.Linear only to cast weights for fp16; quantize_dynamic matches exact types
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear):
+            module.__class__ = torch.nn.Linear
+
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)